@@ -1,19 +1,22 @@
 """Bridge MQTT account credential events into the database."""
 from __future__ import annotations
 
-import json
 import logging
 import threading
 from typing import Any, Optional
 
 import paho.mqtt.client as mqtt
 
-from . import database, node_credentials
+from . import database, json_codec, node_credentials
 from .mqtt_tls import connect_mqtt_client
 
 
 _LOGGER = logging.getLogger(__name__)
 
+_TOPIC_PREFIX = "ul/"
+_TOPIC_SUFFIX = "/evt/account"
+_TOPIC_FILTER = f"{_TOPIC_PREFIX}+{_TOPIC_SUFFIX}"
+
 
 class AccountLinker:
     """Listen for account credential events and persist associations."""
@@ -64,16 +67,19 @@ class AccountLinker:
     def _on_connect(
         self, client: mqtt.Client, userdata, flags, reason_code, properties=None
     ) -> None:
-        client.subscribe("ul/+/evt/account")
+        client.subscribe(_TOPIC_FILTER)
 
     def _on_message(self, client: mqtt.Client, userdata, msg: mqtt.MQTTMessage) -> None:  # type: ignore[override]
+        # Only ``ul/<node>/evt/account`` is subscribed, so slicing the node id
+        # out between the fixed prefix and suffix avoids splitting the topic.
         topic = msg.topic or ""
-        parts = topic.split("/")
-        if len(parts) < 4 or parts[0] != "ul" or parts[2] != "evt":
+        if not topic.startswith(_TOPIC_PREFIX) or not topic.endswith(_TOPIC_SUFFIX):
+            return
+        node_id = topic[len(_TOPIC_PREFIX) : -len(_TOPIC_SUFFIX)]
+        if not node_id or "/" in node_id:
             return
-        node_id = parts[1]
         try:
-            payload = json.loads(msg.payload.decode("utf-8"))
+            payload = json_codec.loads(msg.payload)
         except Exception:
             _LOGGER.warning("Failed to decode account payload from node '%s'", node_id)
             return
@@ -10,6 +10,7 @@ from .security import (
     hash_password,
     needs_rehash,
     set_session_cookie,
+    shutdown_bcrypt_pool,
     verify_password,
     verify_session_token,
 )
@@ -26,6 +27,7 @@ __all__ = [
     "init_auth_storage",
     "needs_rehash",
     "set_session_cookie",
+    "shutdown_bcrypt_pool",
     "verify_password",
     "verify_session_token",
 ]
@@ -2,14 +2,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
 
+from sqlalchemy import event
 from sqlmodel import Session, select
 
 from .. import registry
 from ..config import settings
 from .models import House, HouseMembership, HouseRole, RoomAccess, User
 
+# ``Session.info`` key holding policies built during the current request.
+_POLICY_CACHE_KEY = "ultralights.access_policies"
+
 
 @dataclass
 class HouseAccess:
@@ -18,7 +22,7 @@ class HouseAccess:
     house: Optional[House]
     membership_id: Optional[int]
     role: Optional[HouseRole]
-    allowed_rooms: Optional[Set[str]] = None
+    allowed_rooms: Optional[FrozenSet[str]] = None
 
     def can_manage(self, user: User) -> bool:
         """Return ``True`` if ``user`` may administer the house."""
@@ -30,14 +34,16 @@ class HouseAccess:
     def can_view_room(self, room_id: str) -> bool:
         """Return ``True`` if ``room_id`` is visible under this access."""
 
-        if self.allowed_rooms is None:
-            return True
-        return room_id in self.allowed_rooms
+        allowed = self.allowed_rooms
+        return allowed is None or room_id in allowed
 
 
 @dataclass
 class HouseContext:
-    """Holds registry data for a house filtered by access."""
+    """Holds registry data for a house filtered by access.
+
+    ``filtered`` shares its room dicts with the registry; treat it as read-only.
+    """
 
     original: Dict[str, Any]
     filtered: Dict[str, Any]
@@ -48,7 +54,10 @@ class HouseContext:
 
 @dataclass
 class RoomContext:
-    """Holds registry data for a room filtered by access."""
+    """Holds registry data for a room filtered by access.
+
+    ``filtered_room`` is the registry's own room dict; treat it as read-only.
+    """
 
     house: HouseContext
     room: Dict[str, Any]
@@ -63,26 +72,22 @@ class NodeContext:
     node: Dict[str, Any]
 
 
-def _load_memberships(session: Session, user: User) -> Sequence[tuple[HouseMembership, House]]:
+def _load_memberships(
+    session: Session, user: User
+) -> Sequence[tuple[HouseMembership, House, Optional[RoomAccess]]]:
+    """Return memberships with their house and room grants in one round trip."""
+
     return session.exec(
-        select(HouseMembership, House)
+        select(HouseMembership, House, RoomAccess)
         .join(House, House.id == HouseMembership.house_id)
+        .outerjoin(RoomAccess, RoomAccess.membership_id == HouseMembership.id)
         .where(HouseMembership.user_id == user.id)
     ).all()
 
 
-def _load_room_access(session: Session, membership_ids: Iterable[int]) -> Sequence[RoomAccess]:
-    id_list = [mid for mid in membership_ids if mid is not None]
-    if not id_list:
-        return []
-    return session.exec(
-        select(RoomAccess)
-        .where(RoomAccess.membership_id.in_(id_list))
-    ).all()
-
-
 def _registry_houses() -> List[Dict[str, Any]]:
-    registry.ensure_house_external_ids(persist=False)
+    # External ids are assigned at startup and whenever a house is created, so
+    # there is no need to sweep the registry on every request.
     return settings.DEVICE_REGISTRY
 
 
@@ -115,40 +120,41 @@ def build_access_map(session: Session, user: User) -> Dict[str, HouseAccess]:
             )
         return access
 
-    membership_rows = _load_memberships(session, user)
     membership_lookup: Dict[int, HouseAccess] = {}
+    granted_rooms: Dict[int, List[str]] = {}
 
-    for membership, house in membership_rows:
-        external_id = house.external_id
-        if not isinstance(external_id, str):
-            continue
-        if membership.role == HouseRole.ADMIN:
-            allowed_rooms: Optional[Set[str]] = None
-        else:
-            allowed_rooms = set()
-        entry = HouseAccess(
-            house=house,
-            membership_id=membership.id,
-            role=membership.role,
-            allowed_rooms=allowed_rooms,
-        )
-        access[external_id] = entry
-        if membership.id is not None and allowed_rooms is not None:
+    for membership, house, room_access in _load_memberships(session, user):
+        entry = membership_lookup.get(membership.id)
+        if entry is None:
+            external_id = house.external_id
+            if not isinstance(external_id, str):
+                continue
+            entry = HouseAccess(
+                house=house,
+                membership_id=membership.id,
+                role=membership.role,
+                allowed_rooms=None,
+            )
+            access[external_id] = entry
             membership_lookup[membership.id] = entry
+            if membership.role != HouseRole.ADMIN:
+                granted_rooms[membership.id] = []
+        rooms = granted_rooms.get(membership.id)
+        if room_access is None or rooms is None:
+            continue
+        room_id = str(room_access.room_id).strip()
+        if room_id:
+            rooms.append(room_id)
 
-    if membership_lookup:
-        for entry in _load_room_access(session, membership_lookup.keys()):
-            house_entry = membership_lookup.get(entry.membership_id)
-            if not house_entry or house_entry.allowed_rooms is None:
-                continue
-            room_id = str(entry.room_id).strip()
-            if room_id:
-                house_entry.allowed_rooms.add(room_id)
+    # Guests only see the rooms they were granted; freeze the grants once so
+    # the access map can be shared without defensive copies.
+    for membership_id, rooms in granted_rooms.items():
+        membership_lookup[membership_id].allowed_rooms = frozenset(rooms)
 
     return access
 
 
-def _filter_rooms(house: Dict[str, Any], allowed_rooms: Optional[Set[str]]) -> List[Dict[str, Any]]:
+def _filter_rooms(house: Dict[str, Any], allowed_rooms: Optional[FrozenSet[str]]) -> List[Dict[str, Any]]:
     rooms: List[Dict[str, Any]] = []
     raw_rooms = house.get("rooms")
     if not isinstance(raw_rooms, list):
@@ -161,20 +167,41 @@ def _filter_rooms(house: Dict[str, Any], allowed_rooms: Optional[Set[str]]) -> L
             continue
         if allowed_rooms is not None and room_id not in allowed_rooms:
             continue
-        rooms.append(dict(entry))
+        rooms.append(entry)
     return rooms
 
 
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+def _clear_policy_cache(session: Session, *_: Any) -> None:
+    session.info.pop(_POLICY_CACHE_KEY, None)
+
+
 class AccessPolicy:
     """Authorization helper for requests."""
 
     def __init__(self, user: User, houses: Dict[str, HouseAccess]):
         self.user = user
         self._houses = houses
+        # external_id -> (source house, source rooms, room count, filtered copy)
+        self._filtered_cache: Dict[str, tuple[Dict[str, Any], Any, int, Dict[str, Any]]] = {}
 
     @classmethod
     def from_session(cls, session: Session, user: User) -> "AccessPolicy":
-        return cls(user=user, houses=build_access_map(session, user))
+        """Return the policy for ``user``, reusing one built on ``session``.
+
+        Sessions are scoped to a single request, so repeated access checks
+        within that request share one ``build_access_map`` query.  The cache is
+        dropped whenever the session writes to the database.
+        """
+
+        cache: Dict[int, AccessPolicy] = session.info.setdefault(_POLICY_CACHE_KEY, {})
+        policy = cache.get(user.id) if user.id is not None else None
+        if policy is None:
+            policy = cls(user=user, houses=build_access_map(session, user))
+            if user.id is not None:
+                cache[user.id] = policy
+        return policy
 
     def get_house_access(self, external_id: str) -> Optional[HouseAccess]:
         entry = self._houses.get(external_id)
@@ -204,8 +231,19 @@ class AccessPolicy:
         access = self.get_house_access(external_id)
         if access is None:
             return None
+        raw_rooms = house.get("rooms")
+        room_count = len(raw_rooms) if isinstance(raw_rooms, list) else 0
+        cached = self._filtered_cache.get(external_id)
+        if (
+            cached is not None
+            and cached[0] is house
+            and cached[1] is raw_rooms
+            and cached[2] == room_count
+        ):
+            return cached[3]
         filtered = dict(house)
         filtered["rooms"] = _filter_rooms(house, access.allowed_rooms)
+        self._filtered_cache[external_id] = (house, raw_rooms, room_count, filtered)
         return filtered
 
     def ensure_house(self, house_id: str) -> HouseContext:
@@ -230,22 +268,15 @@ class AccessPolicy:
 
     def ensure_room(self, house_id: str, room_id: str) -> RoomContext:
         house = self.ensure_house(house_id)
-        room = None
-        for entry in house.original.get("rooms", []) or []:
-            if isinstance(entry, dict) and entry.get("id") == room_id:
-                room = entry
-                break
+        room = registry.get_room(house.original, room_id)
         if room is None:
             raise LookupError("room not found")
         if not house.access.can_view_room(room_id):
             raise PermissionError("room forbidden")
-        filtered_room = next(
-            (r for r in house.filtered.get("rooms", []) if r.get("id") == room_id),
-            None,
-        )
+        filtered_room = registry.get_room(house.filtered, room_id)
         if filtered_room is None:
-            filtered_room = dict(room)
-        return RoomContext(house=house, room=room, filtered_room=dict(filtered_room))
+            filtered_room = room
+        return RoomContext(house=house, room=room, filtered_room=filtered_room)
 
     def ensure_node(self, node_id: str) -> NodeContext:
         house, room, node = registry.find_node(node_id)
@@ -268,16 +299,13 @@ class AccessPolicy:
             external_id=external_id,
             access=access,
         )
-        filtered_room = next(
-            (r for r in filtered_house.get("rooms", []) if r.get("id") == room_id),
-            None,
-        )
+        filtered_room = registry.get_room(filtered_house, room_id)
         if filtered_room is None:
-            filtered_room = dict(room)
+            filtered_room = room
         room_ctx = RoomContext(
             house=house_ctx,
             room=room,
-            filtered_room=dict(filtered_room),
+            filtered_room=filtered_room,
         )
         return NodeContext(room=room_ctx, node=dict(node))
 
@@ -1,7 +1,12 @@
 """FastAPI dependencies for authentication."""
 from __future__ import annotations
 
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
 from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import event
 from sqlmodel import Session, select
 
 from ..database import get_session
@@ -9,11 +14,66 @@ from .models import User
 from .security import SESSION_COOKIE_NAME, SessionTokenData, verify_session_token
 
 
+# Authenticated users are cached briefly so every request does not reload the
+# same row.  Edits made through this process invalidate entries immediately;
+# the TTL bounds how long changes made elsewhere (e.g. the CLI) go unnoticed.
+USER_CACHE_TTL_SECONDS = 30.0
+_USER_CACHE_LIMIT = 1024
+
+_UserCacheKey = Tuple[str, int]
+_user_cache: Dict[_UserCacheKey, Tuple[float, User]] = {}
+_user_cache_lock = Lock()
+
+
+def _user_cache_key(session: Session, user_id: int) -> _UserCacheKey:
+    return (str(session.get_bind().url), user_id)
+
+
+def _cached_user(key: _UserCacheKey) -> Optional[User]:
+    with _user_cache_lock:
+        entry = _user_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            _user_cache.pop(key, None)
+            return None
+        return entry[1]
+
+
+def _store_user(key: _UserCacheKey, user: User) -> None:
+    with _user_cache_lock:
+        if len(_user_cache) >= _USER_CACHE_LIMIT:
+            _user_cache.clear()
+        _user_cache[key] = (time.monotonic() + USER_CACHE_TTL_SECONDS, user)
+
+
+def forget_user(user_id: Optional[int] = None) -> None:
+    """Drop cached copies of ``user_id`` (or every user when ``None``)."""
+
+    with _user_cache_lock:
+        if user_id is None:
+            _user_cache.clear()
+            return
+        for key in [key for key in _user_cache if key[1] == user_id]:
+            _user_cache.pop(key, None)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _forget_changed_user(_mapper, _connection, target: User) -> None:
+    forget_user(target.id)
+
+
 def get_current_user(
     request: Request,
     session: Session = Depends(get_session),
 ) -> User:
-    """Return the authenticated ``User`` or raise ``401``."""
+    """Return the authenticated ``User`` or raise ``401``.
+
+    The returned instance is not attached to ``session`` and only carries
+    ``id``, ``username`` and ``server_admin``; load the row explicitly when
+    other columns are needed.
+    """
 
     token_value = request.cookies.get(SESSION_COOKIE_NAME)
     if not token_value:
@@ -23,9 +83,21 @@ def get_current_user(
     if token_data is None:
         raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Not authenticated")
 
-    user = session.exec(select(User).where(User.id == token_data.user_id)).first()
-    if not user:
-        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Not authenticated")
+    cache_key = _user_cache_key(session, token_data.user_id)
+    user = _cached_user(cache_key)
+    if user is None:
+        row = session.exec(
+            select(User.id, User.username, User.server_admin).where(
+                User.id == token_data.user_id
+            )
+        ).first()
+        if not row:
+            raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Not authenticated")
+        # Request handlers only read these columns, so build a transient
+        # ``User`` from them instead of loading and tracking the whole row.
+        # Being unattached, it is safe to share across requests.
+        user = User(id=row[0], username=row[1], server_admin=bool(row[2]))
+        _store_user(cache_key, user)
 
     request.state.user = user
     request.state.session_token = token_data
@@ -40,5 +112,5 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
     return current_user
 
 
-__all__ = ["get_current_user", "require_admin"]
+__all__ = ["forget_user", "get_current_user", "require_admin"]
 
@@ -9,9 +9,11 @@ from sqlalchemy import (
     Column,
     DateTime,
     Enum as SAEnum,
+    Index,
     JSON,
     String,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.sql import func
 from sqlmodel import Field, SQLModel
@@ -40,6 +42,15 @@ def _timestamp_column(*, onupdate: bool = False) -> Column:
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Partial index: only the handful of server admins are indexed.
+        Index(
+            "ix_users_server_admin",
+            "server_admin",
+            postgresql_where=text("server_admin"),
+            sqlite_where=text("server_admin"),
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     username: str = Field(
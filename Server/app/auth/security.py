@@ -5,20 +5,47 @@ import base64
 import binascii
 import hashlib
 import hmac
-import json
+import multiprocessing
+import os
 import secrets
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from threading import BoundedSemaphore, Lock
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from passlib.context import CryptContext
+import bcrypt
+from sqlalchemy import bindparam
 from sqlmodel import Session, select
 
 from ..config import settings
 from .models import User
 
 
-_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_BCRYPT_IDENT = "2b"
+# bcrypt releases the GIL, so request threads hash in parallel; cap the
+# concurrent work at the core count so a login flood queues instead of
+# oversubscribing the CPU.
+_bcrypt_slots = BoundedSemaphore(max(2, os.cpu_count() or 1))
+# Optional worker processes for bcrypt (``BCRYPT_USE_SUBPROCESSES=1``),
+# started on first use so CLI tools keep hashing in-process.
+_bcrypt_pool: Optional[ProcessPoolExecutor] = None
+_bcrypt_pool_lock = Lock()
+
+# Password verification cache ---------------------------------------------
+# Successful (and, briefly, failed) bcrypt checks are remembered under an HMAC
+# of the credentials keyed by a per-process pepper, so the plaintext is never
+# stored.  Entries also record the hash they were checked against and are
+# ignored once the stored hash changes.
+VERIFY_CACHE_TTL_SECONDS = 300.0
+VERIFY_CACHE_NEGATIVE_TTL_SECONDS = 30.0
+_VERIFY_CACHE_LIMIT = 4096
+_verify_hmac = hmac.new(secrets.token_bytes(32), digestmod=hashlib.sha256)
+_verify_cache: Dict[bytes, Tuple[float, bool, Optional[str]]] = {}
+_verify_cache_lock = Lock()
 
 # Cookies ------------------------------------------------------------------
 SESSION_COOKIE_NAME = "ultralights_session"
@@ -27,6 +54,16 @@ SESSION_TOKEN_TTL_SECONDS = int(SESSION_TOKEN_TTL.total_seconds())
 SESSION_COOKIE_PATH = "/"
 SESSION_COOKIE_SAMESITE = "lax"
 
+# Tokens --------------------------------------------------------------------
+# Signed body: user id, expiry (unix seconds), username length, then a random
+# nonce and the UTF-8 username.
+_TOKEN_HEADER = struct.Struct("<qqH")
+_TOKEN_NONCE_BYTES = 8
+_TOKEN_PREFIX_SIZE = _TOKEN_HEADER.size + _TOKEN_NONCE_BYTES
+_TOKEN_SIGNATURE_SIZE = hashlib.sha256().digest_size
+# Latest expiry ``datetime`` can represent (9999-12-31T23:59:59Z).
+_MAX_EXPIRY_TS = 253402300799
+
 
 @dataclass
 class SessionTokenData:
@@ -34,11 +71,50 @@ class SessionTokenData:
 
     user_id: int
     username: Optional[str]
-    expires_at: datetime
+    expires_ts: int
+
+    @property
+    def expires_at(self) -> datetime:
+        return datetime.fromtimestamp(self.expires_ts, tz=timezone.utc)
 
     @property
     def is_expired(self) -> bool:
-        return datetime.now(timezone.utc) >= self.expires_at
+        return time.time() >= self.expires_ts
+
+
+def _bcrypt_process_pool() -> Optional[ProcessPoolExecutor]:
+    global _bcrypt_pool
+
+    if not settings.BCRYPT_USE_SUBPROCESSES:
+        return None
+    with _bcrypt_pool_lock:
+        if _bcrypt_pool is None:
+            # Forking a process that already runs paho, uvicorn and scheduler
+            # threads can copy a held lock into the child; spawn starts clean.
+            _bcrypt_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _bcrypt_pool
+
+
+def shutdown_bcrypt_pool() -> None:
+    """Stop the bcrypt worker processes, if any were started."""
+
+    global _bcrypt_pool
+
+    with _bcrypt_pool_lock:
+        pool, _bcrypt_pool = _bcrypt_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _run_bcrypt(func: Callable[..., Any], *args: Any) -> Any:
+    with _bcrypt_slots:
+        pool = _bcrypt_process_pool()
+        if pool is None:
+            return func(*args)
+        return pool.submit(func, *args).result()
 
 
 def hash_password(password: str) -> str:
@@ -46,7 +122,9 @@ def hash_password(password: str) -> str:
 
     if not isinstance(password, str):
         raise TypeError("password must be a string")
-    return _pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS, prefix=_BCRYPT_IDENT.encode("ascii"))
+    hashed = _run_bcrypt(bcrypt.hashpw, password.encode("utf-8"), salt)
+    return hashed.decode("ascii")
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
@@ -55,7 +133,12 @@ def verify_password(password: str, hashed_password: str) -> bool:
     if not password or not hashed_password:
         return False
     try:
-        return _pwd_context.verify(password, hashed_password)
+        password_bytes = password.encode("utf-8")
+        hashed_bytes = hashed_password.encode("ascii")
+    except UnicodeEncodeError:
+        return False
+    try:
+        return _run_bcrypt(bcrypt.checkpw, password_bytes, hashed_bytes)
     except ValueError:
         return False
 
@@ -65,7 +148,15 @@ def needs_rehash(hashed_password: str) -> bool:
 
     if not hashed_password:
         return True
-    return _pwd_context.needs_update(hashed_password)
+    # Modular crypt format: ``$<ident>$<cost>$<salt+checksum>``.
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or parts[0] or parts[1] != _BCRYPT_IDENT:
+        return True
+    try:
+        rounds = int(parts[2])
+    except ValueError:
+        return True
+    return rounds != settings.BCRYPT_ROUNDS
 
 
 def normalize_username(value: object) -> str:
@@ -76,19 +167,66 @@ def normalize_username(value: object) -> str:
     return str(value).strip().lower()
 
 
+# Built once so each login reuses the same statement (and its cache key).
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+
+
 def authenticate_user(session: Session, username: str, password: str) -> Optional[User]:
     """Return the ``User`` that matches ``username``/``password`` or ``None``."""
 
     normalized = normalize_username(username)
     if not normalized or not password:
         return None
-    statement = select(User).where(User.username == normalized)
-    user = session.exec(statement).first()
-    if not user:
-        return None
-    if not verify_password(password, user.hashed_password):
-        return None
-    return user
+    user = session.exec(_USER_BY_USERNAME, params={"username": normalized}).first()
+    stored_hash = user.hashed_password if user else None
+
+    key = _verification_key(normalized, password)
+    verified = _cached_verification(key, stored_hash)
+    if verified is None:
+        # Unknown users are checked against a throwaway hash so the response
+        # time does not reveal whether the account exists.
+        verified = verify_password(password, stored_hash or _dummy_hash())
+        verified = verified and user is not None
+        _remember_verification(key, verified, stored_hash)
+    return user if verified else None
+
+
+@lru_cache(maxsize=1)
+def _dummy_hash() -> str:
+    return hash_password(secrets.token_urlsafe(32))
+
+
+def _verification_key(username: str, password: str) -> bytes:
+    mac = _verify_hmac.copy()
+    mac.update(f"{username}\0{password}".encode("utf-8"))
+    return mac.digest()
+
+
+def _cached_verification(key: bytes, stored_hash: Optional[str]) -> Optional[bool]:
+    with _verify_cache_lock:
+        entry = _verify_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, verified, snapshot = entry
+        if expires_at <= time.monotonic() or snapshot != stored_hash:
+            _verify_cache.pop(key, None)
+            return None
+        return verified
+
+
+def _remember_verification(key: bytes, verified: bool, stored_hash: Optional[str]) -> None:
+    ttl = VERIFY_CACHE_TTL_SECONDS if verified else VERIFY_CACHE_NEGATIVE_TTL_SECONDS
+    with _verify_cache_lock:
+        if len(_verify_cache) >= _VERIFY_CACHE_LIMIT:
+            _verify_cache.clear()
+        _verify_cache[key] = (time.monotonic() + ttl, verified, stored_hash)
+
+
+def reset_verification_cache() -> None:
+    """Forget every cached password verification."""
+
+    with _verify_cache_lock:
+        _verify_cache.clear()
 
 
 def create_session_token(
@@ -101,15 +239,14 @@ def create_session_token(
     if user.id is None:
         raise ValueError("user must be persisted before creating a session token")
     lifetime = expires_delta or SESSION_TOKEN_TTL
-    expires_at = datetime.now(timezone.utc) + lifetime
-    payload = {
-        "sub": int(user.id),
-        "usr": user.username,
-        "exp": int(expires_at.timestamp()),
-        "nonce": secrets.token_hex(8),
-    }
-    payload_bytes = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
-    signature = hmac.new(_secret_key(), payload_bytes, hashlib.sha256).digest()
+    expires_ts = int(time.time() + lifetime.total_seconds())
+    username_bytes = (user.username or "").encode("utf-8")
+    payload_bytes = (
+        _TOKEN_HEADER.pack(int(user.id), expires_ts, len(username_bytes))
+        + secrets.token_bytes(_TOKEN_NONCE_BYTES)
+        + username_bytes
+    )
+    signature = _sign(payload_bytes)
     return f"{_b64encode(payload_bytes)}.{_b64encode(signature)}"
 
 
@@ -125,29 +262,27 @@ def verify_session_token(token: str) -> Optional[SessionTokenData]:
     except (ValueError, binascii.Error):
         return None
 
-    expected_signature = hmac.new(
-        _secret_key(), payload_bytes, hashlib.sha256
-    ).digest()
+    # The signature length is public; reject malformed ones before hashing.
+    if len(signature) != _TOKEN_SIGNATURE_SIZE:
+        return None
+    expected_signature = _sign(payload_bytes)
     if not hmac.compare_digest(signature, expected_signature):
         return None
 
-    try:
-        payload = json.loads(payload_bytes.decode("utf-8"))
-    except (json.JSONDecodeError, UnicodeDecodeError):
+    if len(payload_bytes) < _TOKEN_PREFIX_SIZE:
         return None
-
-    user_id = _coerce_int(payload.get("sub"))
-    expires_ts = _coerce_int(payload.get("exp"))
-    username = payload.get("usr")
-    if user_id is None or expires_ts is None:
+    user_id, expires_ts, username_length = _TOKEN_HEADER.unpack_from(payload_bytes)
+    if len(payload_bytes) != _TOKEN_PREFIX_SIZE + username_length:
+        return None
+    try:
+        username = payload_bytes[_TOKEN_PREFIX_SIZE:].decode("utf-8")
+    except UnicodeDecodeError:
         return None
 
-    expires_at = datetime.fromtimestamp(expires_ts, tz=timezone.utc)
-    if expires_at <= datetime.now(timezone.utc):
+    if not time.time() < expires_ts <= _MAX_EXPIRY_TS:
         return None
 
-    clean_username = str(username) if username is not None else None
-    return SessionTokenData(user_id=user_id, username=clean_username, expires_at=expires_at)
+    return SessionTokenData(user_id=user_id, username=username or None, expires_ts=expires_ts)
 
 
 def set_session_cookie(response, token: str) -> None:
@@ -187,26 +322,49 @@ def _secret_key() -> bytes:
     return secret.encode("utf-8")
 
 
+# (secret, keyed HMAC) reused via ``copy()`` so the key schedule is computed
+# once; rebuilt whenever ``settings.SESSION_SECRET`` changes.
+_signing_template: Optional[Tuple[str, "hmac.HMAC"]] = None
+
+
+def _sign(payload: bytes) -> bytes:
+    global _signing_template
+
+    template = _signing_template
+    if template is None or template[0] != settings.SESSION_SECRET:
+        template = (settings.SESSION_SECRET, hmac.new(_secret_key(), digestmod=hashlib.sha256))
+        _signing_template = template
+    mac = template[1].copy()
+    mac.update(payload)
+    return mac.digest()
+
+
+# (PUBLIC_BASE, secure flag) so the prefix check only reruns when the
+# configured base URL is replaced.
+_cookie_secure_cache: Optional[Tuple[str, bool]] = None
+
+
 def _session_cookie_secure() -> bool:
-    return settings.PUBLIC_BASE.startswith("https://")
+    global _cookie_secure_cache
+
+    public_base = settings.PUBLIC_BASE
+    cached = _cookie_secure_cache
+    if cached is None or cached[0] is not public_base:
+        cached = (public_base, public_base.startswith("https://"))
+        _cookie_secure_cache = cached
+    return cached[1]
 
 
 def _b64encode(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
 
 
-def _b64decode(data: str) -> bytes:
-    padding = "=" * (-len(data) % 4)
-    return base64.urlsafe_b64decode(data + padding)
+# Padding needed to restore a stripped base64 string, indexed by ``len % 4``.
+_B64_PADDING = ("", "===", "==", "=")
 
 
-def _coerce_int(value: object) -> Optional[int]:
-    if isinstance(value, int):
-        return value
-    try:
-        return int(value)  # type: ignore[arg-type]
-    except (TypeError, ValueError):
-        return None
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + _B64_PADDING[len(data) & 3])
 
 
 __all__ = [
@@ -219,7 +377,9 @@ __all__ = [
     "create_session_token",
     "hash_password",
     "needs_rehash",
+    "reset_verification_cache",
     "set_session_cookie",
+    "shutdown_bcrypt_pool",
     "verify_password",
     "verify_session_token",
 ]
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import inspect, text
+from sqlalchemy import exists, inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlmodel import SQLModel, Session, select
 
 from .. import node_credentials, registry
@@ -13,26 +15,35 @@ from .models import AuditLog, House, User
 from .security import hash_password, normalize_username
 
 
+# Dialect-specific INSERT constructs that support ``ON CONFLICT DO NOTHING``.
+_CONFLICT_IGNORING_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+
 def init_auth_storage() -> None:
     """Ensure tables exist and seed initial data."""
 
     SQLModel.metadata.create_all(database.engine)
     _ensure_node_registration_columns()
+    _ensure_user_indexes()
 
-    with database.SessionLocal() as session:
+    # Seed and sync in one transaction so startup pays for a single commit.
+    with database.SessionLocal.begin() as session:
         _seed_initial_admin(session)
         _sync_registry_houses(session)
-        node_credentials.migrate_credentials_to_registrations(session)
+        node_credentials.migrate_credentials_to_registrations(session, commit=False)
         _sync_registry_nodes(session)
 
 
+_SERVER_ADMIN_EXISTS = select(exists().where(User.server_admin.is_(True)))
+
+
 def _seed_initial_admin(session: Session) -> None:
     """Create the initial server admin when the table is empty."""
 
-    existing_admin = session.exec(
-        select(User).where(User.server_admin.is_(True))
-    ).first()
-    if existing_admin:
+    if session.scalar(_SERVER_ADMIN_EXISTS):
         return
 
     username = normalize_username(settings.INITIAL_ADMIN_USERNAME)
@@ -42,76 +53,120 @@ def _seed_initial_admin(session: Session) -> None:
         return
 
     hashed = hash_password(password)
-    user = User(username=username, hashed_password=hashed, server_admin=True)
-    session.add(user)
-    session.commit()
+    session.add(User(username=username, hashed_password=hashed, server_admin=True))
 
 
 def _sync_registry_houses(session: Session) -> None:
     """Ensure ``House`` rows exist for each registry entry."""
 
+    # One normalising pass up front; afterwards every entry carries a valid
+    # ``external_id`` and the loop can read it directly.
+    registry.ensure_house_external_ids(persist=False)
+    rows: List[Dict[str, Any]] = []
+    for entry in settings.DEVICE_REGISTRY:
+        external_id = entry["external_id"]
+        display_name = str(entry.get("name") or entry.get("id") or external_id)
+        rows.append({"display_name": display_name, "external_id": external_id})
+    if not rows:
+        return
+
+    insert_factory = _CONFLICT_IGNORING_INSERTS.get(session.get_bind().dialect.name)
+    if insert_factory is not None:
+        statement = insert_factory(House).values(rows).on_conflict_do_nothing(
+            index_elements=["external_id"]
+        )
+        session.exec(statement)  # type: ignore[call-overload]
+        return
+
     existing = {
         external_id
         for external_id in session.exec(select(House.external_id))
         if isinstance(external_id, str)
     }
-
-    for entry in settings.DEVICE_REGISTRY:
-        external_id = registry.get_house_external_id(entry)
-        if external_id in existing:
+    for row in rows:
+        if row["external_id"] in existing:
             continue
-        display_name = str(entry.get("name") or entry.get("id") or external_id)
-        session.add(House(display_name=display_name, external_id=external_id))
-
-    session.commit()
+        existing.add(row["external_id"])
+        session.add(House(**row))
 
 
 def _sync_registry_nodes(session: Session) -> None:
     """Ensure credential rows exist for every registry node."""
 
-    node_credentials.sync_registry_nodes(session)
+    node_credentials.sync_registry_nodes(session, commit=False)
+
+
+_CERTIFICATE_COLUMNS: Dict[str, str] = {
+    "certificate_fingerprint": "VARCHAR(128)",
+    "certificate_pem_path": "VARCHAR(255)",
+    "private_key_pem_path": "VARCHAR(255)",
+    "certificate_bundle_path": "VARCHAR(255)",
+}
+
+# Columns added after the first release: ``{table: {column: SQL type}}``.
+_BACKFILLED_COLUMNS: Dict[str, Dict[str, str]] = {
+    "node_registrations": {
+        "account_username": "VARCHAR(64)",
+        "account_credentials_received_at": "TIMESTAMP",
+        **_CERTIFICATE_COLUMNS,
+    },
+    "node_credentials": dict(_CERTIFICATE_COLUMNS),
+}
 
 
 def _ensure_node_registration_columns() -> None:
     """Backfill newly added ``node_registrations`` columns if missing."""
 
     inspector = inspect(database.engine)
-    required: Dict[str, Dict[str, str]] = {
-        "node_registrations": {
-            "account_username": "ALTER TABLE node_registrations ADD COLUMN account_username VARCHAR(64)",
-            "account_credentials_received_at": "ALTER TABLE node_registrations ADD COLUMN account_credentials_received_at TIMESTAMP",
-            "certificate_fingerprint": "ALTER TABLE node_registrations ADD COLUMN certificate_fingerprint VARCHAR(128)",
-            "certificate_pem_path": "ALTER TABLE node_registrations ADD COLUMN certificate_pem_path VARCHAR(255)",
-            "private_key_pem_path": "ALTER TABLE node_registrations ADD COLUMN private_key_pem_path VARCHAR(255)",
-            "certificate_bundle_path": "ALTER TABLE node_registrations ADD COLUMN certificate_bundle_path VARCHAR(255)",
-        },
-        "node_credentials": {
-            "certificate_fingerprint": "ALTER TABLE node_credentials ADD COLUMN certificate_fingerprint VARCHAR(128)",
-            "certificate_pem_path": "ALTER TABLE node_credentials ADD COLUMN certificate_pem_path VARCHAR(255)",
-            "private_key_pem_path": "ALTER TABLE node_credentials ADD COLUMN private_key_pem_path VARCHAR(255)",
-            "certificate_bundle_path": "ALTER TABLE node_credentials ADD COLUMN certificate_bundle_path VARCHAR(255)",
-        },
-    }
-
+    existing = _existing_columns(inspector, list(_BACKFILLED_COLUMNS))
     statements: List[str] = []
-    for table_name, column_statements in required.items():
-        try:
-            existing = {
-                column_info["name"]
-                for column_info in inspector.get_columns(table_name)
-            }
-        except Exception:  # pragma: no cover - table may not exist yet
+    for table_name, column_types in _BACKFILLED_COLUMNS.items():
+        columns = existing.get(table_name)
+        if columns is None:  # table may not exist yet
             continue
-        for column_name, statement in column_statements.items():
-            if column_name not in existing:
-                statements.append(statement)
+        for column_name, column_type in column_types.items():
+            if column_name not in columns:
+                statements.append(
+                    f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"
+                )
 
     if not statements:
         return
 
+    # One transaction for every ALTER; SQLite's driver cannot run several
+    # statements from a single string, so they are still issued one by one.
     with database.engine.begin() as connection:
         for statement in statements:
-            connection.execute(text(statement))
+            connection.exec_driver_sql(statement)
+
+
+def _ensure_user_indexes() -> None:
+    """Create ``users`` indexes added after the table was first created."""
+
+    for index in User.__table__.indexes:
+        index.create(database.engine, checkfirst=True)
+
+
+def _existing_columns(inspector: Any, table_names: List[str]) -> Dict[str, set[str]]:
+    """Return ``{table: {column, ...}}`` for the tables that exist."""
+
+    present = [name for name in table_names if inspector.has_table(name)]
+    if not present:
+        return {}
+    get_multi_columns = getattr(inspector, "get_multi_columns", None)
+    if callable(get_multi_columns):
+        # SQLAlchemy 2.x reflects every requested table in one pass.
+        reflected = get_multi_columns(filter_names=present)
+        return {
+            table_name: {column_info["name"] for column_info in columns}
+            for (_schema, table_name), columns in reflected.items()
+        }
+    return {
+        table_name: {
+            column_info["name"] for column_info in inspector.get_columns(table_name)
+        }
+        for table_name in present
+    }
 
 
 def create_user(
@@ -1,20 +1,23 @@
 """Helpers for throttling repeated authentication attempts."""
 from __future__ import annotations
 
-from collections import deque
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
 from threading import Lock
-from typing import Callable, Deque, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..config import settings
 
+try:
+    import redis
+except ImportError:  # pragma: no cover - exercised when redis is missing
+    redis = None  # type: ignore[assignment]
 
-_TimeProvider = Callable[[], datetime]
 
+_TimeProvider = Callable[[], float]
 
-def _default_time_provider() -> datetime:
-    return datetime.now(timezone.utc)
+# Must be a power of two so identifiers can be mapped with a bit mask.
+_SHARD_COUNT = 64
 
 
 @dataclass
@@ -25,8 +28,27 @@ class RateLimitState:
     retry_after: int = 0
 
 
+class _Shard:
+    """One lock-guarded slice of the limiter state."""
+
+    __slots__ = ("attempts", "blocked_until", "lock")
+
+    def __init__(self) -> None:
+        # identifier -> (failures in window, window start)
+        self.attempts: Dict[str, Tuple[int, float]] = {}
+        self.blocked_until: Dict[str, float] = {}
+        self.lock = Lock()
+
+
 class LoginRateLimiter:
-    """Track failed login attempts and enforce a cooldown window."""
+    """Track failed login attempts and enforce a cooldown window.
+
+    Failures are counted per identifier in a fixed window that opens with the
+    first failure; reaching ``max_attempts`` inside it blocks the identifier
+    for ``block_seconds``.  Times come from a monotonic clock.  State is
+    split across independently locked shards so concurrent logins for
+    different identifiers do not contend on one lock.
+    """
 
     def __init__(
         self,
@@ -44,77 +66,158 @@ class LoginRateLimiter:
             raise ValueError("block_seconds must be greater than zero")
 
         self._max_attempts = max_attempts
-        self._window = timedelta(seconds=window_seconds)
-        self._block = timedelta(seconds=block_seconds)
-        self._time_provider: _TimeProvider = time_provider or _default_time_provider
-        self._attempts: Dict[str, Deque[datetime]] = {}
-        self._blocked_until: Dict[str, datetime] = {}
-        self._lock = Lock()
-
-    def _now(self) -> datetime:
+        self._window = float(window_seconds)
+        self._block = float(block_seconds)
+        self._time_provider: _TimeProvider = time_provider or time.monotonic
+        self._shards: List[_Shard] = [_Shard() for _ in range(_SHARD_COUNT)]
+
+    def _now(self) -> float:
         return self._time_provider()
 
-    def _prune_attempts(self, identifier: str, *, now: datetime) -> None:
-        attempts = self._attempts.get(identifier)
-        if not attempts:
-            return
-        threshold = now - self._window
-        while attempts and attempts[0] < threshold:
-            attempts.popleft()
-        if not attempts:
-            self._attempts.pop(identifier, None)
-
-    def _status_locked(self, identifier: str, *, now: datetime) -> RateLimitState:
-        blocked_until = self._blocked_until.get(identifier)
-        if blocked_until and blocked_until > now:
-            retry_after = int((blocked_until - now).total_seconds())
-            return RateLimitState(blocked=True, retry_after=max(retry_after, 1))
-
-        if blocked_until and blocked_until <= now:
-            self._blocked_until.pop(identifier, None)
-
-        self._prune_attempts(identifier, now=now)
+    def _shard(self, identifier: str) -> _Shard:
+        return self._shards[hash(identifier) & (_SHARD_COUNT - 1)]
+
+    def _status_locked(
+        self, shard: _Shard, identifier: str, *, now: float
+    ) -> RateLimitState:
+        blocked_until = shard.blocked_until.get(identifier)
+        if blocked_until is not None:
+            if blocked_until > now:
+                retry_after = int(blocked_until - now)
+                return RateLimitState(blocked=True, retry_after=max(retry_after, 1))
+            shard.blocked_until.pop(identifier, None)
+
+        attempt = shard.attempts.get(identifier)
+        if attempt is not None and now - attempt[1] >= self._window:
+            shard.attempts.pop(identifier, None)
         return RateLimitState(blocked=False, retry_after=0)
 
     def status(self, identifier: str) -> RateLimitState:
         """Return the current rate-limit status for ``identifier``."""
 
-        with self._lock:
-            return self._status_locked(identifier, now=self._now())
+        shard = self._shard(identifier)
+        with shard.lock:
+            return self._status_locked(shard, identifier, now=self._now())
 
     def register_failure(self, identifier: str) -> RateLimitState:
         """Record a failed attempt and return the updated status."""
 
-        with self._lock:
+        shard = self._shard(identifier)
+        with shard.lock:
             now = self._now()
-            state = self._status_locked(identifier, now=now)
+            state = self._status_locked(shard, identifier, now=now)
             if state.blocked:
                 return state
 
-            attempts = self._attempts.setdefault(identifier, deque())
-            attempts.append(now)
-            self._prune_attempts(identifier, now=now)
-            if len(attempts) >= self._max_attempts:
-                blocked_until = now + self._block
-                self._blocked_until[identifier] = blocked_until
-                attempts.clear()
-                retry_after = int(self._block.total_seconds())
-                return RateLimitState(blocked=True, retry_after=max(retry_after, 1))
+            count, window_start = shard.attempts.get(identifier, (0, now))
+            count += 1
+            if count >= self._max_attempts:
+                shard.blocked_until[identifier] = now + self._block
+                shard.attempts.pop(identifier, None)
+                return RateLimitState(blocked=True, retry_after=max(int(self._block), 1))
 
+            shard.attempts[identifier] = (count, window_start)
             return RateLimitState(blocked=False, retry_after=0)
 
     def register_success(self, identifier: str) -> None:
         """Clear throttling state after a successful login."""
 
-        with self._lock:
-            self._attempts.pop(identifier, None)
-            self._blocked_until.pop(identifier, None)
+        shard = self._shard(identifier)
+        with shard.lock:
+            shard.attempts.pop(identifier, None)
+            shard.blocked_until.pop(identifier, None)
+
+
+# KEYS: failure counter, block marker.  ARGV: window ms, limit, block ms.
+_REDIS_FAILURE_SCRIPT = """
+local blocked = redis.call('PTTL', KEYS[2])
+if blocked > 0 then
+    return {1, blocked}
+end
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+if count >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    redis.call('SET', KEYS[2], 1, 'PX', ARGV[3])
+    return {1, tonumber(ARGV[3])}
+end
+return {0, 0}
+"""
+
+
+class RedisLoginRateLimiter:
+    """Login limiter backed by Redis so every worker shares one budget.
+
+    Mirrors :class:`LoginRateLimiter`; each failure is a single atomic script
+    call, and the counters expire in Redis rather than in process memory.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        max_attempts: int,
+        window_seconds: int,
+        block_seconds: int,
+        key_prefix: str = "ul:login:",
+    ) -> None:
+        if max_attempts <= 0:
+            raise ValueError("max_attempts must be greater than zero")
+        if window_seconds <= 0:
+            raise ValueError("window_seconds must be greater than zero")
+        if block_seconds <= 0:
+            raise ValueError("block_seconds must be greater than zero")
+
+        self._client = client
+        self._max_attempts = max_attempts
+        self._window_ms = int(window_seconds * 1000)
+        self._block_ms = int(block_seconds * 1000)
+        self._key_prefix = key_prefix
+        self._register_failure_script = client.register_script(_REDIS_FAILURE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisLoginRateLimiter":
+        if redis is None:
+            raise RuntimeError("LOGIN_RATE_LIMIT_REDIS_URL requires the redis package")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _keys(self, identifier: str) -> Tuple[str, str]:
+        base = self._key_prefix + identifier
+        return base + ":failures", base + ":blocked"
+
+    @staticmethod
+    def _state(blocked: int, retry_ms: int) -> RateLimitState:
+        if not blocked:
+            return RateLimitState(blocked=False, retry_after=0)
+        return RateLimitState(blocked=True, retry_after=max(int(retry_ms) // 1000, 1))
+
+    def status(self, identifier: str) -> RateLimitState:
+        """Return the current rate-limit status for ``identifier``."""
+
+        retry_ms = self._client.pttl(self._keys(identifier)[1])
+        return self._state(retry_ms > 0, retry_ms)
+
+    def register_failure(self, identifier: str) -> RateLimitState:
+        """Record a failed attempt and return the updated status."""
+
+        blocked, retry_ms = self._register_failure_script(
+            keys=list(self._keys(identifier)),
+            args=[self._window_ms, self._max_attempts, self._block_ms],
+        )
+        return self._state(int(blocked), int(retry_ms))
+
+    def register_success(self, identifier: str) -> None:
+        """Clear throttling state after a successful login."""
+
+        self._client.delete(*self._keys(identifier))
 
 
-_login_rate_limiter: LoginRateLimiter | None = None
+_login_rate_limiter: LoginRateLimiter | RedisLoginRateLimiter | None = None
 
 
-def get_login_rate_limiter() -> LoginRateLimiter:
+def get_login_rate_limiter() -> LoginRateLimiter | RedisLoginRateLimiter:
     """Return the singleton rate limiter configured from settings."""
 
     if _login_rate_limiter is None:  # pragma: no cover - defensive
@@ -123,7 +226,9 @@ def get_login_rate_limiter() -> LoginRateLimiter:
     return _login_rate_limiter
 
 
-def reset_login_rate_limiter(limiter: Optional[LoginRateLimiter] = None) -> None:
+def reset_login_rate_limiter(
+    limiter: LoginRateLimiter | RedisLoginRateLimiter | None = None,
+) -> None:
     """Replace the global limiter, primarily for startup and tests."""
 
     global _login_rate_limiter
@@ -131,12 +236,24 @@ def reset_login_rate_limiter(limiter: Optional[LoginRateLimiter] = None) -> None
         _login_rate_limiter = limiter
         return
 
-    _login_rate_limiter = LoginRateLimiter(
+    options = dict(
         max_attempts=settings.LOGIN_ATTEMPT_LIMIT,
         window_seconds=settings.LOGIN_ATTEMPT_WINDOW,
         block_seconds=settings.LOGIN_BACKOFF_SECONDS,
     )
-
-
-__all__ = ["LoginRateLimiter", "RateLimitState", "get_login_rate_limiter", "reset_login_rate_limiter"]
+    if settings.LOGIN_RATE_LIMIT_REDIS_URL:
+        _login_rate_limiter = RedisLoginRateLimiter.from_url(
+            settings.LOGIN_RATE_LIMIT_REDIS_URL, **options
+        )
+    else:
+        _login_rate_limiter = LoginRateLimiter(**options)
+
+
+__all__ = [
+    "LoginRateLimiter",
+    "RateLimitState",
+    "RedisLoginRateLimiter",
+    "get_login_rate_limiter",
+    "reset_login_rate_limiter",
+]
 
@@ -5,13 +5,13 @@ from __future__ import annotations
 import json
 import logging
 import threading
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import paho.mqtt.client as mqtt
 
+from . import json_codec
 from .config import settings
 from .mqtt_tls import connect_mqtt_client
 
@@ -284,7 +284,9 @@ class BrightnessCurveApplicator:
         self.store = store
         self._last: Dict[Tuple[str, str], Dict[str, int]] = {}
         self._last_sent: Dict[_StateKey, Dict[str, Any]] = {}
-        self._shutdown = False
+        # Set by ``stop()``; the worker waits on it between ticks so it
+        # exits as soon as shutdown is requested.
+        self._shutdown = threading.Event()
         self._thread: Optional[threading.Thread] = None
 
         # MQTT state tracker — learns current effect state from retained cmd topics
@@ -343,7 +345,7 @@ class BrightnessCurveApplicator:
         except (ValueError, IndexError):
             return
         try:
-            payload = json.loads(msg.payload.decode("utf-8"))
+            payload = json_codec.loads(msg.payload)
         except Exception:
             return
         if not isinstance(payload, dict):
@@ -361,26 +363,24 @@ class BrightnessCurveApplicator:
     # ------------------------------------------------------------------
 
     def start(self) -> None:
+        self._shutdown.clear()
         self._start_state_tracker()
         self._thread = threading.Thread(target=self._worker, daemon=True, name="brightness-curve")
         self._thread.start()
 
     def stop(self) -> None:
-        self._shutdown = True
+        self._shutdown.set()
         if self._thread is not None:
             self._thread.join(timeout=5.0)
         self._stop_state_tracker()
 
     def _worker(self) -> None:
-        while not self._shutdown:
+        while not self._shutdown.is_set():
             try:
                 self._tick()
             except Exception:
                 logger.exception("brightness curve tick failed")
-            for _ in range(self.TICK_INTERVAL):
-                if self._shutdown:
-                    return
-                time.sleep(1)
+            self._shutdown.wait(self.TICK_INTERVAL)
 
     # ------------------------------------------------------------------
     # Core logic — apply brightness to a room's nodes
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
-import json
+import atexit
+import sys
 import threading
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
+from . import json_codec
 from .config import settings
+from .persistence import (
+    ChannelKey,
+    DebouncedSave,
+    JsonJournal,
+    LazyStore,
+    format_channel_key,
+    intern_channel_key,
+    nest_channel_values,
+    write_atomic,
+)
 
 
 class BrightnessLimitsStore:
@@ -13,103 +26,170 @@ class BrightnessLimitsStore:
 
     def __init__(self, path: Path) -> None:
         self.path = path
-        self._lock = threading.RLock()
-        self._data = self._load()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # Changes are appended to a journal and folded into the snapshot
+        # file only once the journal has grown well past it.
+        self._journal = JsonJournal(
+            path.with_suffix(path.suffix + ".log"), on_written=self._compact_if_due
+        )
+        self._snapshot_size = path.stat().st_size if path.exists() else 0
+        self._data: Dict[ChannelKey, int] = self._load()
+        # node id -> read-only per-node view handed to readers, dropped on change.
+        self._node_views: Dict[str, Mapping[str, Mapping[str, int]]] = {}
+        self._pending_save = DebouncedSave(self.save)
+
+    def _load(self) -> Dict[ChannelKey, int]:
+        data = self._load_snapshot()
+        for record in self._journal.replay():
+            key = intern_channel_key(record.get("n"), record.get("m"), record.get("c"))
+            value = record.get("v")
+            if value is None:
+                data.pop(key, None)
+            elif isinstance(value, (int, float)) and 0 <= value <= 255:
+                data[key] = int(value)
+        return data
 
-    def _load(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+    def _load_snapshot(self) -> Dict[ChannelKey, int]:
         if not self.path.exists():
             return {}
         try:
-            payload = json.loads(self.path.read_text())
+            payload = json_codec.loads(self.path.read_bytes())
         except Exception:
             return {}
 
-        data: Dict[str, Dict[str, Dict[str, int]]] = {}
+        data: Dict[ChannelKey, int] = {}
         if not isinstance(payload, dict):
             return data
 
         for node_id, modules in payload.items():
             if not isinstance(modules, dict):
                 continue
-            node_key = str(node_id)
-            node_limits: Dict[str, Dict[str, int]] = {}
+            node_key = sys.intern(str(node_id))
             for module, channels in modules.items():
                 if not isinstance(channels, dict):
                     continue
-                module_limits: Dict[str, int] = {}
+                module_key = sys.intern(str(module))
                 for channel, value in channels.items():
                     if not isinstance(value, (int, float)):
                         continue
                     limit = int(value)
                     if 0 <= limit <= 255:
-                        module_limits[str(channel)] = limit
-                if module_limits:
-                    node_limits[str(module)] = module_limits
-            if node_limits:
-                data[node_key] = node_limits
+                        data[(node_key, module_key, format_channel_key(channel))] = limit
         return data
 
-    def _save_locked(self) -> None:
-        serialized = json.dumps(self._data, indent=2)
-        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path.write_text(serialized)
-        tmp_path.replace(self.path)
+    def _update_locked(self, key: ChannelKey, limit: Optional[int]) -> bool:
+        """Apply an already clamped ``limit``; return whether anything changed."""
+
+        if limit is None:
+            return self._data.pop(key, None) is not None
+        if self._data.get(key) == limit:
+            # Re-submitting the current value needs no journal record.
+            return False
+        self._data[key] = limit
+        return True
+
+    def _record_locked(self, changes: Sequence[Tuple[ChannelKey, Optional[int]]]) -> None:
+        for (node_key, _, _), _ in changes:
+            self._node_views.pop(node_key, None)
+        self._journal.extend(
+            {"n": node_key, "m": module_key, "c": channel_key, "v": limit}
+            for (node_key, module_key, channel_key), limit in changes
+        )
+
+    def _compact_if_due(self) -> None:
+        if self._journal.should_compact(self._snapshot_size):
+            self._pending_save.schedule()
 
     def save(self) -> None:
-        with self._lock:
-            self._save_locked()
+        """Write a snapshot and drop the journal records it supersedes."""
+
+        with self._save_lock:
+            with self._lock:
+                serialized = json_codec.dumps_pretty(
+                    nest_channel_values(self._data.items())
+                )
+                self._journal.rotate()
+            write_atomic(self.path, serialized)
+            with self._lock:
+                self._snapshot_size = len(serialized)
+            self._journal.discard_rotated()
+
+    def flush(self) -> None:
+        """Write queued journal records and any compaction still pending."""
+
+        self._journal.sync()
+        self._pending_save.flush()
 
     def get_limit(self, node_id: str, module: str, channel: int) -> Optional[int]:
-        channel_key = str(channel)
-        with self._lock:
-            module_limits = (
-                self._data.get(str(node_id), {}).get(str(module), {})
-            )
-            value = module_limits.get(channel_key)
-            if value is None:
-                return None
-            return int(value)
+        return self._data.get((str(node_id), str(module), format_channel_key(channel)))
+
+    @staticmethod
+    def _clamp(limit: Optional[int]) -> Optional[int]:
+        return None if limit is None else max(0, min(255, int(limit)))
 
     def set_limit(
         self, node_id: str, module: str, channel: int, limit: Optional[int]
     ) -> Optional[int]:
-        node_key = str(node_id)
-        module_key = str(module)
-        channel_key = str(channel)
+        key = intern_channel_key(node_id, module, channel)
+        limit = self._clamp(limit)
         with self._lock:
-            if limit is None:
-                node_limits = self._data.get(node_key)
-                if not node_limits:
-                    return None
-                module_limits = node_limits.get(module_key)
-                if not module_limits or channel_key not in module_limits:
-                    return None
-                module_limits.pop(channel_key, None)
-                if not module_limits:
-                    node_limits.pop(module_key, None)
-                if not node_limits:
-                    self._data.pop(node_key, None)
-                self._save_locked()
-                return None
-
-            limit = max(0, min(255, int(limit)))
-            node_limits = self._data.setdefault(node_key, {})
-            module_limits = node_limits.setdefault(module_key, {})
-            module_limits[channel_key] = limit
-            self._save_locked()
-            return limit
-
-    def get_limits_for_node(self, node_id: str) -> Dict[str, Dict[str, int]]:
+            if self._update_locked(key, limit):
+                self._record_locked(((key, limit),))
+        return limit
+
+    def set_limits_bulk(
+        self, updates: Iterable[Tuple[str, str, int, Optional[int]]]
+    ) -> List[Optional[int]]:
+        """Apply ``(node, module, channel, limit)`` updates as one journal write.
+
+        Returns the stored limit for each update, in order.
+        """
+
+        keyed = [
+            (intern_channel_key(node_id, module, channel), self._clamp(limit))
+            for node_id, module, channel, limit in updates
+        ]
         with self._lock:
-            modules = self._data.get(str(node_id))
-            if not modules:
-                return {}
-            return {
-                module: dict(channels)
-                for module, channels in modules.items()
-            }
+            changes = [(key, limit) for key, limit in keyed if self._update_locked(key, limit)]
+            if changes:
+                self._record_locked(changes)
+        return [limit for _, limit in keyed]
 
+    def get_limits_for_node(self, node_id: str) -> Mapping[str, Mapping[str, int]]:
+        """Return a read-only view of the node's limits."""
 
-brightness_limits = BrightnessLimitsStore(settings.BRIGHTNESS_LIMITS_FILE)
-
+        node_key = str(node_id)
+        # Views are immutable, so a cached one can be returned without the
+        # lock; only building a missing view needs a consistent read.
+        view = self._node_views.get(node_key)
+        if view is not None:
+            return view
+        with self._lock:
+            view = self._node_views.get(node_key)
+            if view is None:
+                modules = nest_channel_values(
+                    item for item in self._data.items() if item[0][0] == node_key
+                ).get(node_key, {})
+                view = MappingProxyType(
+                    {
+                        module: MappingProxyType(channels)
+                        for module, channels in modules.items()
+                    }
+                )
+                self._node_views[node_key] = view
+            return view
+
+    def get_limits_for_node_mutable(self, node_id: str) -> Dict[str, Dict[str, int]]:
+        """Return a private, mutable copy of the node's limits."""
+
+        return {
+            module: dict(channels)
+            for module, channels in self.get_limits_for_node(node_id).items()
+        }
+
+
+brightness_limits: BrightnessLimitsStore = LazyStore(  # type: ignore[assignment]
+    lambda: BrightnessLimitsStore(settings.BRIGHTNESS_LIMITS_FILE)
+)
+atexit.register(brightness_limits.flush)
@@ -1,12 +1,25 @@
 """Persistence helpers for per-channel custom names."""
 from __future__ import annotations
 
-import json
+import atexit
+import sys
 import threading
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Sequence, Tuple
 
+from . import json_codec
 from .config import settings
+from .persistence import (
+    ChannelKey,
+    DebouncedSave,
+    JsonJournal,
+    LazyStore,
+    format_channel_key,
+    intern_channel_key,
+    nest_channel_values,
+    write_atomic,
+)
 
 
 class ChannelNameStore:
@@ -14,117 +27,143 @@ class ChannelNameStore:
 
     def __init__(self, path: Path) -> None:
         self.path = path
-        self._lock = threading.RLock()
-        self._data = self._load()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        # Changes are appended to a journal and folded into the snapshot
+        # file only once the journal has grown well past it.
+        self._journal = JsonJournal(
+            path.with_suffix(path.suffix + ".log"), on_written=self._compact_if_due
+        )
+        self._snapshot_size = path.stat().st_size if path.exists() else 0
+        self._data: Dict[ChannelKey, str] = self._load()
+        # node id -> read-only per-node view handed to readers, dropped on change.
+        self._node_views: Dict[str, Mapping[str, Mapping[str, str]]] = {}
+        self._pending_save = DebouncedSave(self.save)
+
+    def _load(self) -> Dict[ChannelKey, str]:
+        data = self._load_snapshot()
+        for record in self._journal.replay():
+            key = intern_channel_key(record.get("n"), record.get("m"), record.get("c"))
+            name = record.get("v")
+            if isinstance(name, str) and name.strip():
+                data[key] = name.strip()
+            else:
+                data.pop(key, None)
+        return data
 
-    def _load(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+    def _load_snapshot(self) -> Dict[ChannelKey, str]:
         if not self.path.exists():
             return {}
         try:
-            payload = json.loads(self.path.read_text())
+            payload = json_codec.loads(self.path.read_bytes())
         except Exception:
             return {}
 
-        data: Dict[str, Dict[str, Dict[str, str]]] = {}
+        data: Dict[ChannelKey, str] = {}
         if not isinstance(payload, dict):
             return data
 
         for node_id, modules in payload.items():
             if not isinstance(modules, dict):
                 continue
-            node_key = str(node_id)
-            node_entries: Dict[str, Dict[str, str]] = {}
+            node_key = sys.intern(str(node_id))
             for module, channels in modules.items():
                 if not isinstance(channels, dict):
                     continue
-                module_entries: Dict[str, str] = {}
+                module_key = sys.intern(str(module))
                 for channel, name in channels.items():
                     if not isinstance(name, str):
                         continue
                     clean = name.strip()
-                    if not clean:
-                        continue
-                    module_entries[str(channel)] = clean
-                if module_entries:
-                    node_entries[str(module)] = module_entries
-            if node_entries:
-                data[node_key] = node_entries
+                    if clean:
+                        data[(node_key, module_key, format_channel_key(channel))] = clean
         return data
 
-    def _save_locked(self) -> None:
-        serialized = json.dumps(self._data, indent=2, ensure_ascii=False)
-        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path.write_text(serialized)
-        tmp_path.replace(self.path)
+    def _update_locked(self, key: ChannelKey, name: Optional[str]) -> bool:
+        """Apply an already cleaned ``name``; return whether anything changed."""
+
+        if name is None:
+            return self._data.pop(key, None) is not None
+        if self._data.get(key) == name:
+            return False
+        self._data[key] = name
+        return True
+
+    def _record_locked(self, changes: Sequence[Tuple[ChannelKey, Optional[str]]]) -> None:
+        for (node_key, _, _), _ in changes:
+            self._node_views.pop(node_key, None)
+        self._journal.extend(
+            {"n": node_key, "m": module_key, "c": channel_key, "v": name}
+            for (node_key, module_key, channel_key), name in changes
+        )
+
+    def _compact_if_due(self) -> None:
+        if self._journal.should_compact(self._snapshot_size):
+            self._pending_save.schedule()
 
     def save(self) -> None:
-        with self._lock:
-            self._save_locked()
-
-    def _cleanup(self, node_key: str, module_key: str) -> None:
-        node_entries = self._data.get(node_key)
-        if not node_entries:
-            return
-        module_entries = node_entries.get(module_key)
-        if module_entries is not None and not module_entries:
-            node_entries.pop(module_key, None)
-        if not node_entries:
-            self._data.pop(node_key, None)
+        """Write a snapshot and drop the journal records it supersedes."""
+
+        with self._save_lock:
+            with self._lock:
+                serialized = json_codec.dumps_pretty(
+                    nest_channel_values(self._data.items())
+                )
+                self._journal.rotate()
+            write_atomic(self.path, serialized)
+            with self._lock:
+                self._snapshot_size = len(serialized)
+            self._journal.discard_rotated()
+
+    def flush(self) -> None:
+        """Write queued journal records and any compaction still pending."""
+
+        self._journal.sync()
+        self._pending_save.flush()
 
     def get_name(self, node_id: str, module: str, channel: int) -> Optional[str]:
-        with self._lock:
-            module_entries = self._data.get(str(node_id), {}).get(str(module), {})
-            value = module_entries.get(str(channel))
-            if value is None:
-                return None
-            return str(value)
+        return self._data.get((str(node_id), str(module), format_channel_key(channel)))
+
+    @staticmethod
+    def _clean(name: Optional[str]) -> Optional[str]:
+        # Empty strings behave the same as clearing the name.
+        clean = "" if name is None else str(name).strip()
+        return clean[:80] or None
 
     def set_name(
         self, node_id: str, module: str, channel: int, name: Optional[str]
     ) -> Optional[str]:
-        node_key = str(node_id)
-        module_key = str(module)
-        channel_key = str(channel)
+        key = intern_channel_key(node_id, module, channel)
+        clean = self._clean(name)
         with self._lock:
-            if name is None:
-                module_entries = self._data.get(node_key, {}).get(module_key)
-                if not module_entries or channel_key not in module_entries:
-                    return None
-                module_entries.pop(channel_key, None)
-                self._cleanup(node_key, module_key)
-                self._save_locked()
-                return None
-
-            clean = str(name).strip()
-            if not clean:
-                # Empty strings behave the same as clearing the name.
-                module_entries = self._data.get(node_key, {}).get(module_key)
-                if module_entries and channel_key in module_entries:
-                    module_entries.pop(channel_key, None)
-                    self._cleanup(node_key, module_key)
-                    self._save_locked()
-                return None
-
-            if len(clean) > 80:
-                clean = clean[:80]
-
-            node_entries = self._data.setdefault(node_key, {})
-            module_entries = node_entries.setdefault(module_key, {})
-            module_entries[channel_key] = clean
-            self._save_locked()
-            return clean
-
-    def get_names_for_node(self, node_id: str) -> Dict[str, Dict[str, str]]:
-        with self._lock:
-            modules = self._data.get(str(node_id))
-            if not modules:
-                return {}
-            return {
-                module: dict(channels)
-                for module, channels in modules.items()
-            }
-
+            if self._update_locked(key, clean):
+                self._record_locked(((key, clean),))
+        return clean
 
-channel_names = ChannelNameStore(settings.CHANNEL_NAMES_FILE)
+    def get_names_for_node(self, node_id: str) -> Mapping[str, Mapping[str, str]]:
+        """Return a read-only view of the node's names."""
 
+        node_key = str(node_id)
+        view = self._node_views.get(node_key)
+        if view is not None:
+            return view
+        with self._lock:
+            view = self._node_views.get(node_key)
+            if view is None:
+                modules = nest_channel_values(
+                    item for item in self._data.items() if item[0][0] == node_key
+                ).get(node_key, {})
+                view = MappingProxyType(
+                    {
+                        module: MappingProxyType(channels)
+                        for module, channels in modules.items()
+                    }
+                )
+                self._node_views[node_key] = view
+            return view
+
+
+channel_names: ChannelNameStore = LazyStore(  # type: ignore[assignment]
+    lambda: ChannelNameStore(settings.CHANNEL_NAMES_FILE)
+)
+atexit.register(channel_names.flush)
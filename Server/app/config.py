@@ -1,7 +1,10 @@
 import os, json
+from functools import cached_property
 from pathlib import Path
 from dotenv import load_dotenv
 
+from . import json_codec
+
 load_dotenv()  # reads .env in the project root
 
 class Settings:
@@ -54,6 +57,9 @@ class Settings:
     LOGIN_ATTEMPT_LIMIT = int(os.getenv("LOGIN_ATTEMPT_LIMIT", "5"))
     LOGIN_ATTEMPT_WINDOW = int(os.getenv("LOGIN_ATTEMPT_WINDOW", "300"))
     LOGIN_BACKOFF_SECONDS = int(os.getenv("LOGIN_BACKOFF_SECONDS", "900"))
+    LOGIN_RATE_LIMIT_REDIS_URL = os.getenv("LOGIN_RATE_LIMIT_REDIS_URL", "")
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_USE_SUBPROCESSES = os.getenv("BCRYPT_USE_SUBPROCESSES", "0") == "1"
 
     # ------------------------------------------------------------------
     # Device registry ---------------------------------------------------
@@ -129,11 +135,14 @@ class Settings:
             str(Path(__file__).with_name("brightness_curve.json")),
         )
     )
-    if REGISTRY_FILE.exists():
-        DEVICE_REGISTRY = json.loads(REGISTRY_FILE.read_text())
-    else:
-        DEVICE_REGISTRY = DEFAULT_REGISTRY
-        REGISTRY_FILE.write_text(json.dumps(DEVICE_REGISTRY, indent=2))
+
+    @cached_property
+    def DEVICE_REGISTRY(self) -> list:
+        # Read on first access so importing the settings does no registry I/O.
+        if self.REGISTRY_FILE.exists():
+            return json_codec.loads(self.REGISTRY_FILE.read_bytes())
+        self.REGISTRY_FILE.write_text(json.dumps(self.DEFAULT_REGISTRY, indent=2))
+        return self.DEFAULT_REGISTRY
 
     def resolve_data_path(self, path: str | os.PathLike[str]) -> Path:
         candidate = Path(path)
@@ -3,8 +3,10 @@ from __future__ import annotations
 
 from typing import Any, Iterator
 
+from sqlalchemy import event
 from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 from sqlmodel import Session, create_engine
 
 from .config import settings
@@ -29,12 +31,51 @@ def _ensure_sqlite_directory(database_url: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+def _is_sqlite_memory(database_url: str) -> bool:
+    try:
+        database = make_url(database_url).database
+    except Exception:
+        return False
+    return not database or database == ":memory:" or database.startswith("file::memory:")
+
+
+def _enable_sqlite_wal(dbapi_connection: Any, _connection_record: Any) -> None:
+    # WAL lets readers proceed while a write is in progress, and NORMAL
+    # sync only fsyncs at checkpoints instead of on every commit.
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    finally:
+        cursor.close()
+
+
 def _build_engine(database_url: str):
     _ensure_sqlite_directory(database_url)
-    connect_args: dict[str, Any] = {}
-    if database_url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
-    return create_engine(database_url, connect_args=connect_args, future=True)
+    if not database_url.startswith("sqlite"):
+        return create_engine(database_url, future=True)
+
+    connect_args: dict[str, Any] = {"check_same_thread": False}
+    if _is_sqlite_memory(database_url):
+        # Every connection to ":memory:" is a new empty database, so all
+        # threads have to share the one connection.
+        return create_engine(
+            database_url,
+            connect_args=connect_args,
+            poolclass=StaticPool,
+            future=True,
+        )
+
+    engine = create_engine(
+        database_url,
+        connect_args=connect_args,
+        poolclass=QueuePool,
+        pool_size=5,
+        max_overflow=10,
+        future=True,
+    )
+    event.listen(engine, "connect", _enable_sqlite_wal)
+    return engine
 
 
 engine = _build_engine(settings.AUTH_DB_URL)
@@ -1,12 +1,18 @@
+from __future__ import annotations
+
 import re
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping
 
 ROOT = Path(__file__).resolve().parents[2]
 
 _WS_EFFECT_PATTERN = re.compile(
-    r'\{\s*"(?P<name>[a-zA-Z0-9_]+)"\s*,\s*(?P<tier>WS_EFFECT_TIER_[A-Z_]+)'
+    rb'\{\s*"(?P<name>[a-zA-Z0-9_]+)"\s*,\s*(?P<tier>WS_EFFECT_TIER_[A-Z_]+)'
 )
 
+_EFFECT_NAME_PATTERN = re.compile(rb'\{"([a-zA-Z0-9_]+)"')
+
 _WS_TIER_NAME_MAP = {
     "WS_EFFECT_TIER_STANDARD": "standard",
     "WS_EFFECT_TIER_PSRAM": "psram",
@@ -18,33 +24,70 @@ def _load_ws_effect_tiers(rel: str) -> dict[str, str]:
     if not path.exists():
         return {}
     effects: dict[str, str] = {}
-    text = path.read_text()
-    for match in _WS_EFFECT_PATTERN.finditer(text):
-        name = match.group("name")
-        tier_const = match.group("tier")
-        tier = _WS_TIER_NAME_MAP.get(tier_const, "standard")
-        effects[name] = tier
+    # Scan the raw bytes; the names are ASCII so nothing else needs decoding.
+    for name, tier_const in _WS_EFFECT_PATTERN.findall(path.read_bytes()):
+        tier = _WS_TIER_NAME_MAP.get(tier_const.decode("ascii"), "standard")
+        effects[name.decode("ascii")] = tier
     return effects
 
 
-def _load_effect_names(rel: str) -> list[str]:
+def _load_effect_names(rel: str) -> frozenset[str]:
     path = ROOT / rel
     if not path.exists():
-        return []
-    text = path.read_text()
-    return re.findall(r'\{"([a-zA-Z0-9_]+)"', text)
+        return frozenset()
+    data = path.read_bytes()
+    return frozenset(
+        match.decode("ascii") for match in _EFFECT_NAME_PATTERN.findall(data)
+    )
 
 
-WS_EFFECT_TIERS = _load_ws_effect_tiers(
-    "UltraNodeV5/components/ul_ws_engine/effects_ws/registry.c"
-)
-WS_EFFECTS = set(WS_EFFECT_TIERS)
-WHITE_EFFECTS = set(
-    _load_effect_names("UltraNodeV5/components/ul_white_engine/effects_white/registry.c")
-)
-RGB_EFFECTS = set(
-    _load_effect_names("UltraNodeV5/components/ul_rgb_engine/effects_rgb/registry.c")
-)
+_WS_REGISTRY = "UltraNodeV5/components/ul_ws_engine/effects_ws/registry.c"
+_WHITE_REGISTRY = "UltraNodeV5/components/ul_white_engine/effects_white/registry.c"
+_RGB_REGISTRY = "UltraNodeV5/components/ul_rgb_engine/effects_rgb/registry.c"
+
+
+_REGISTRIES = (_WS_REGISTRY, _WHITE_REGISTRY, _RGB_REGISTRY)
+
+
+def scan_effects() -> tuple[dict[str, str], frozenset[str], frozenset[str]]:
+    """Read the WS tiers and white/RGB effect names from the firmware sources."""
+
+    return (
+        _load_ws_effect_tiers(_WS_REGISTRY),
+        _load_effect_names(_WHITE_REGISTRY),
+        _load_effect_names(_RGB_REGISTRY),
+    )
+
+
+def registry_stamps() -> dict[str, tuple[int, int] | None]:
+    """Return ``(mtime_ns, size)`` per registry file, or None when missing."""
+
+    stamps: dict[str, tuple[int, int] | None] = {}
+    for rel in _REGISTRIES:
+        try:
+            st = (ROOT / rel).stat()
+        except OSError:
+            stamps[rel] = None
+        else:
+            stamps[rel] = (st.st_mtime_ns, st.st_size)
+    return stamps
+
+
+def _load_effects() -> tuple[dict[str, str], frozenset[str], frozenset[str]]:
+    try:
+        # Written by scripts/gen_effects.py so startup skips the source scan.
+        from . import _effects_data as generated
+    except ImportError:
+        return scan_effects()
+    # Only trust the generated tables while the sources they came from are
+    # unchanged; a stat per file is much cheaper than re-reading them.
+    if getattr(generated, "SOURCE_STAMPS", None) != registry_stamps():
+        return scan_effects()
+    return generated.WS_EFFECT_TIERS, generated.WHITE_EFFECTS, generated.RGB_EFFECTS
+
+
+WS_EFFECT_TIERS, WHITE_EFFECTS, RGB_EFFECTS = _load_effects()
+WS_EFFECTS = frozenset(WS_EFFECT_TIERS)
 
 WS_EFFECT_TIER_LABELS = {
     "standard": "Standard",
@@ -152,3 +195,32 @@ RGB_PARAM_DEFS = {
 
 RGB_PARAM_DEFS.setdefault("solid", [{"type": "color", "label": "Color"}])
 
+
+def _freeze_param_defs(
+    defs: dict[str, list[dict[str, Any]]],
+    shared: dict[tuple, Mapping[str, Any]],
+) -> Mapping[str, tuple[Mapping[str, Any], ...]]:
+    """Return a read-only copy of ``defs``.
+
+    Identical descriptors (e.g. the plain "Color" picker) become a single
+    shared object across effects and modules.
+    """
+
+    def descriptor(entry: dict[str, Any]) -> Mapping[str, Any]:
+        key = tuple(entry.items())
+        frozen = shared.get(key)
+        if frozen is None:
+            frozen = shared[key] = MappingProxyType(dict(entry))
+        return frozen
+
+    return MappingProxyType(
+        {effect: tuple(map(descriptor, params)) for effect, params in defs.items()}
+    )
+
+
+_shared_descriptors: dict[tuple, Mapping[str, Any]] = {}
+WS_PARAM_DEFS = _freeze_param_defs(WS_PARAM_DEFS, _shared_descriptors)
+WHITE_PARAM_DEFS = _freeze_param_defs(WHITE_PARAM_DEFS, _shared_descriptors)
+RGB_PARAM_DEFS = _freeze_param_defs(RGB_PARAM_DEFS, _shared_descriptors)
+del _shared_descriptors
+
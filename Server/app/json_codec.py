@@ -0,0 +1,44 @@
+"""JSON encoding helpers shared by the MQTT and storage layers.
+
+``orjson`` is used when it is installed; otherwise the standard library
+``json`` module provides the same behaviour, just more slowly.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is missing
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize ``value`` to compact UTF-8 encoded JSON."""
+
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_pretty(value: Any) -> bytes:
+    """Serialize ``value`` to UTF-8 JSON indented by two spaces."""
+
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON from ``data`` without requiring a prior UTF-8 decode."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+__all__ = ["dumps", "dumps_pretty", "loads"]
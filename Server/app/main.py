@@ -1,16 +1,16 @@
 import asyncio
+import hashlib
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import AsyncIterator
+from typing import AsyncIterator, Dict, Optional, Tuple
 
-from fastapi import FastAPI
-from fastapi.responses import FileResponse, Response
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
 from starlette.middleware.sessions import SessionMiddleware
 
 from . import registry
 from .account_linker import account_linker
-from .auth import SESSION_TOKEN_TTL_SECONDS, init_auth_storage
+from .auth import SESSION_TOKEN_TTL_SECONDS, init_auth_storage, shutdown_bcrypt_pool
 from .auth.throttling import reset_login_rate_limiter
 from .config import settings
 from .database import get_session
@@ -21,12 +21,14 @@ from .routes_api import router as api_router
 from .routes_house_admin import router as house_admin_router
 from .routes_pages import router as pages_router
 from .routes_server_admin import router as server_admin_router
+from .static_files import CachingStaticFiles, precompress_static
 from .status_monitor import status_monitor
 
 STATIC_DIR = Path(__file__).resolve().parent / "static"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await asyncio.to_thread(precompress_static, STATIC_DIR)
     motion_manager.start()
     status_monitor.start()
     account_linker.start()
@@ -45,10 +47,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         motion_manager.stop()
         status_monitor.stop()
         account_linker.stop()
+        await asyncio.to_thread(shutdown_bcrypt_pool)
 
 
 app = FastAPI(title="UltraLights Hub", version="2.0", lifespan=lifespan)
-app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+app.mount("/static", CachingStaticFiles(directory=str(STATIC_DIR)), name="static")
 
 app.add_middleware(
     SessionMiddleware,
@@ -66,16 +69,33 @@ app.include_router(server_admin_router)
 app.include_router(ota_router)
 
 
+def _load_favicon() -> Optional[Tuple[bytes, str, Dict[str, str]]]:
+    # The favicon never changes while the server runs, so it is read once.
+    for name, media_type in (
+        ("favicon.ico", "image/x-icon"),
+        ("favicon.png", "image/png"),
+        ("favicon.svg", "image/svg+xml"),
+    ):
+        path = STATIC_DIR / name
+        if path.is_file():
+            body = path.read_bytes()
+            headers = {
+                "ETag": f'"{hashlib.sha1(body).hexdigest()}"',
+                "Cache-Control": "public, max-age=604800",
+            }
+            return body, media_type, headers
+    return None
+
+
+_FAVICON = _load_favicon()
+
+
 @app.get("/favicon.ico", include_in_schema=False)
-def favicon():
-    ico = STATIC_DIR / "favicon.ico"
-    png = STATIC_DIR / "favicon.png"
-    svg = STATIC_DIR / "favicon.svg"
-    if ico.exists():
-        return FileResponse(ico, media_type="image/x-icon")
-    if png.exists():
-        return FileResponse(png, media_type="image/png")
-    if svg.exists():
-        return FileResponse(svg, media_type="image/svg+xml")
-    # no file yet – return 204 instead of 404 to stop error spam
-    return Response(status_code=204)
+def favicon(request: Request):
+    if _FAVICON is None:
+        # no file yet – return 204 instead of 404 to stop error spam
+        return Response(status_code=204)
+    body, media_type, headers = _FAVICON
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
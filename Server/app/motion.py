@@ -1,40 +1,90 @@
-import json
 import logging
+import re
 import threading
 import time
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import paho.mqtt.client as mqtt
 
 from .mqtt_bus import MqttBus
-from .mqtt_tls import connect_mqtt_client
 from .presets import apply_preset, get_preset
 from .motion_schedule import motion_schedule
 from .motion_prefs import motion_preferences
-from . import registry
+from .scheduling import DeadlineScheduler
+from . import json_codec, registry
 
 MOTION_STATUS_REQUEST_INTERVAL = 10.0
 # Matches the firmware's fade duration when clearing motion presets.
 MOTION_OFF_FADE_MS = 3000
-
+# Only the PIR reports motion, so the broker's own topic matching drops
+# everything else before it reaches the hub.
+MOTION_TOPICS = ("ul/+/evt/pir/motion", "ul/+/evt/status", "ul/+/evt/pir/status")
+# Node id, then which of node status / PIR status / PIR motion the topic is.
+_MOTION_TOPIC_RE = re.compile(
+    r"ul/(?P<node>[^/]+)/evt/(?:(?P<status>status)|pir/(?:(?P<pir_status>status)|motion))"
+)
+
+# Payload keys that may carry a sensor's active flag, in order of precedence.
+_SENSOR_ACTIVE_KEYS = ("active", "state", "status", "value", "motion", "present")
+# Lower-cased state words and the active flag each one stands for.
+_ACTIVE_WORDS: Dict[str, bool] = {
+    **dict.fromkeys(
+        ("1", "true", "yes", "on", "active", "motion", "motion_detected", "motion_detect", "detected"),
+        True,
+    ),
+    **dict.fromkeys(
+        ("0", "false", "no", "off", "inactive", "clear", "motion_clear", "none"),
+        False,
+    ),
+}
+
+
+def _sensor_map(value: Any) -> Optional[Dict[Any, Any]]:
+    return value if isinstance(value, dict) else None
+
+
+def _module_sensor_map(modules: Any) -> Optional[Dict[Any, Any]]:
+    if isinstance(modules, dict):
+        motion_state = modules.get("motion")
+        if isinstance(motion_state, dict):
+            return _sensor_map(motion_state.get("sensors"))
+    return None
+
+
+def _single_sensor_map(info: Any) -> Optional[Dict[Any, Any]]:
+    if isinstance(info, dict):
+        sensor_id = info.get("id") or info.get("sid")
+        if sensor_id:
+            return {sensor_id: info}
+    return None
+
+
+# Status payload keys that may describe sensors, and how to read each one.
+# Earlier sources win when several report the same sensor id.
+_SENSOR_SOURCES = (
+    ("sensors", _sensor_map),
+    ("modules", _module_sensor_map),
+    ("motion", _sensor_map),
+    ("sensor", _single_sensor_map),
+)
+
+# ``registry.find_node`` result: (house, room, node), any of which may be None.
+_NodeLocation = Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
 
 logger = logging.getLogger(__name__)
 
 
 class MotionManager:
     def __init__(self) -> None:
-        self.bus = MqttBus(client_id="ultralights-motion")
-        self.client = mqtt.Client(
-            mqtt.CallbackAPIVersion.VERSION2,
-            client_id="ultralights-motion-manager",
-        )
-        enable_logger = getattr(self.client, "enable_logger", None)
-        if callable(enable_logger):
-            enable_logger()
-        self.client.on_connect = self._on_connect
-        self.client.on_disconnect = self._on_disconnect
-        self.client.on_message = self._on_message
-        # room_id -> {"house_id": str, "current": str|None, "timers": {sensor: Timer}}
+        # Created on first use so importing this module opens no connection.
+        self._bus: Optional[MqttBus] = None
+        self._bus_lock = threading.Lock()
+        # Motion events arrive on the bus's own connection (see ``start``)
+        # rather than on a second client with its own network thread.
+        self.client: Optional[mqtt.Client] = None
+        self._started = False
+        # room_id -> {"house_id": str, "current": str|None,
+        #   "timers": {sensor: ScheduledCall}}
         # Entries may also track the active preset identifier in ``preset_on``.
         self.active: Dict[str, Dict[str, Any]] = {}
         self.config: Dict[str, Dict[str, Any]] = {}
@@ -42,54 +92,64 @@ class MotionManager:
         #   "room_name": str, "nodes": {node_id: {"node_id": str,
         #   "node_name": str, "config": {...}, "sensors": {...}}}}
         self.room_sensors: Dict[Tuple[str, str], Dict[str, Any]] = {}
-        self._status_request_lock = threading.Lock()
+        # Last request time per node.  Read and written without a lock: a
+        # race only costs the occasional duplicate status request.
         self._status_request_times: Dict[str, float] = {}
         self.motion_preferences = motion_preferences
         self._load_config_from_schedule()
         self._mqtt_connected = False
-        self._loop_thread: Optional[threading.Thread] = None
+        # Sensor timeouts and delayed off commands share one timer thread.
+        self._scheduler = DeadlineScheduler("motion-timers")
+
+    @property
+    def bus(self) -> MqttBus:
+        bus = self._bus
+        if bus is None:
+            with self._bus_lock:
+                bus = self._bus
+                if bus is None:
+                    bus = self._bus = MqttBus(client_id="ultralights-motion")
+        return bus
+
+    @bus.setter
+    def bus(self, bus: MqttBus) -> None:
+        self._bus = bus
 
     def start(self) -> None:
+        if self._started:
+            return
+        self._started = True
         self._seed_room_sensors_from_config()
         self._request_status_for_registry()
-        connected = connect_mqtt_client(
-            self.client,
-            keepalive=30,
-            start_async=True,
-            raise_on_failure=False,
-        )
-        loop_start = getattr(self.client, "loop_start", None)
-        if callable(loop_start):
-            loop_start()
-        if connected:
-            # ``on_connect`` will flip the connected flag once the broker
-            # acknowledges the session.  Until then the manager remains in an
-            # offline state but continues queuing requests.
-            logger.debug("MotionManager MQTT connect scheduled")
-        else:
-            logger.warning(
-                "MotionManager MQTT broker unreachable; running in offline mode"
-            )
-        if not callable(loop_start):
-            self._loop_thread = threading.Thread(
-                target=self.client.loop_forever,
-                daemon=True,
-            )
-            self._loop_thread.start()
         self._mqtt_connected = False
+        client = getattr(self.bus, "client", None)
+        if not (
+            callable(getattr(client, "subscribe", None))
+            and callable(getattr(client, "is_connected", None))
+        ):
+            logger.warning("MotionManager bus has no MQTT client; motion events disabled")
+            return
+        self.client = client
+        client.on_connect = self._on_connect
+        client.on_disconnect = self._on_disconnect
+        client.on_message = self._on_message
+        # The bus connects on its own; if that already happened the callback
+        # above was installed too late, so subscribe now.
+        if client.is_connected():
+            self._on_connect(client, None, None, 0)
 
     def stop(self) -> None:
-        loop_stop = getattr(self.client, "loop_stop", None)
-        if callable(loop_stop):
-            loop_stop()
-        try:
-            self.client.disconnect()
-        except Exception:
-            pass
+        self._started = False
+        client, self.client = self.client, None
+        if client is not None:
+            client.on_connect = None
+            client.on_disconnect = None
+            client.on_message = None
+            try:
+                client.unsubscribe(list(MOTION_TOPICS))
+            except Exception:
+                pass
         self._mqtt_connected = False
-        if self._loop_thread is not None:
-            self._loop_thread.join(timeout=5.0)
-            self._loop_thread = None
         for info in list(self.active.values()):
             for t in info.get("timers", {}).values():
                 try:
@@ -102,8 +162,9 @@ class MotionManager:
         clean_duration = max(1, int(duration))
         config = {"enabled": bool(enabled), "duration": clean_duration}
         self.config[node_id] = config
-        self._ensure_room_sensor_entry(node_id, config=config)
-        house, room, _ = registry.find_node(node_id)
+        location = registry.find_node(node_id)
+        self._ensure_room_sensor_entry(node_id, config=config, location=location)
+        house, room, _ = location
         if house and room:
             house_id = house.get("id")
             room_id = room.get("id")
@@ -136,8 +197,7 @@ class MotionManager:
                 nodes.pop(node_id, None)
                 if not nodes:
                     self.room_sensors.pop(key, None)
-        with self._status_request_lock:
-            self._status_request_times.pop(node_id, None)
+        self._status_request_times.pop(node_id, None)
         self.motion_preferences.remove_node(node_id)
         motion_schedule.remove_sensor_config_for_node(node_id)
 
@@ -195,9 +255,7 @@ class MotionManager:
             self._mqtt_connected = False
             return
 
-        client.subscribe("ul/+/evt/+/motion")
-        client.subscribe("ul/+/evt/status")
-        client.subscribe("ul/+/evt/pir/status")
+        client.subscribe([(topic, 0) for topic in MOTION_TOPICS])
         self._request_status_for_registry(force=True)
         self._mqtt_connected = True
         logger.info("MotionManager MQTT connected: %s", reason_code)
@@ -227,30 +285,23 @@ class MotionManager:
         self._mqtt_connected = False
 
     def _on_message(self, client, userdata, msg: mqtt.MQTTMessage) -> None:
-        topic = msg.topic or ""
-        parts = topic.split("/")
-        if len(parts) < 4 or parts[0] != "ul" or parts[2] != "evt":
+        match = _MOTION_TOPIC_RE.fullmatch(msg.topic or "")
+        if match is None:
             return
-        node_id = parts[1]
-        if len(parts) >= 5 and parts[3] == "pir" and parts[4] == "status":
+        node_id = match.group("node")
+        if match.group("pir_status"):
             self._handle_motion_status_message(node_id, msg)
             return
-        if len(parts) == 4 and parts[3] == "status":
+        if match.group("status"):
             self._handle_status_message(node_id, msg)
             return
-        if len(parts) < 5:
-            return
-        sensor = parts[3]
-        if parts[4] != "motion":
-            return
-        if sensor == "pir":
-            self._record_motion_event(node_id, sensor, msg.payload)
-        if sensor != "pir":
-            return
+        sensor = "pir"
+        location = registry.find_node(node_id)
+        self._record_motion_event(node_id, sensor, msg.payload, location=location)
         cfg = self.config.get(node_id, {"enabled": True, "duration": 30})
         if not cfg.get("enabled", True):
             return
-        house, room, _ = registry.find_node(node_id)
+        house, room, _ = location
         if not room or not house:
             return
         room_id = room["id"]
@@ -273,9 +324,9 @@ class MotionManager:
         if repeat:
             timers[sensor].cancel()
         duration = int(cfg.get("duration", 30))
-        timer = threading.Timer(duration, self._clear_sensor, args=(room_id, sensor))
-        timer.start()
-        timers[sensor] = timer
+        timers[sensor] = self._scheduler.call_later(
+            duration, self._clear_sensor, room_id, sensor
+        )
         entry["current"] = "pir"
         preset_id = motion_schedule.active_preset(entry["house_id"], room_id)
         if not preset_id:
@@ -312,10 +363,7 @@ class MotionManager:
         if not nodes:
             return
         off_targets = self._collect_retained_off_targets(preset, nodes)
-        for node_id in nodes:
-            self.bus.motion_off(
-                node_id, {"fade": {"duration_ms": MOTION_OFF_FADE_MS}}
-            )
+        self.bus.motion_off_many(nodes, {"fade": {"duration_ms": MOTION_OFF_FADE_MS}})
         if off_targets:
             self._schedule_retained_off_commands(room_id, off_targets)
 
@@ -327,13 +375,7 @@ class MotionManager:
         if not isinstance(actions, list):
             return []
 
-        immune_nodes = {
-            node_id
-            for node_id in self.motion_preferences.get_room_immune_nodes(
-                house_id, room_id
-            )
-            if node_id
-        }
+        immune_nodes = self.motion_preferences.get_room_immune_nodes(house_id, room_id)
         room_nodes = self._room_node_ids(house_id, room_id)
         seen: Set[str] = set()
         eligible: List[str] = []
@@ -400,12 +442,9 @@ class MotionManager:
     ) -> None:
         delay = max(0.0, MOTION_OFF_FADE_MS / 1000.0)
 
-        def publish() -> None:
-            self._publish_retained_off_commands(room_id, targets)
-
-        timer = threading.Timer(delay, publish)
-        timer.daemon = True
-        timer.start()
+        self._scheduler.call_later(
+            delay, self._publish_retained_off_commands, room_id, targets
+        )
 
     def _publish_retained_off_commands(
         self, room_id: str, targets: List[Tuple[str, str, int]]
@@ -506,26 +545,44 @@ class MotionManager:
     def _request_motion_status(self, node_id: str, *, force: bool = False) -> None:
         if not node_id:
             return
-        should_request = False
         now = time.monotonic()
-        with self._status_request_lock:
-            last = self._status_request_times.get(node_id)
-            if force or last is None or now - last > MOTION_STATUS_REQUEST_INTERVAL:
-                self._status_request_times[node_id] = now
-                should_request = True
-        if should_request:
+        last = self._status_request_times.get(node_id)
+        if force or last is None or now - last > MOTION_STATUS_REQUEST_INTERVAL:
+            self._status_request_times[node_id] = now
             self.bus.motion_status_request(node_id)
 
+    def _request_motion_statuses(self, node_ids: Iterable[str], *, force: bool = False) -> None:
+        """Ask each node in ``node_ids`` for its sensor status, at most once per interval.
+
+        One clock reading covers the whole batch and the due requests are
+        queued on the bus together.
+        """
+        now = time.monotonic()
+        times = self._status_request_times
+        due = []
+        for node_id in dict.fromkeys(node_ids):
+            last = times.get(node_id)
+            if force or last is None or now - last > MOTION_STATUS_REQUEST_INTERVAL:
+                due.append(node_id)
+        times.update(dict.fromkeys(due, now))
+        if due:
+            self.bus.motion_status_request_many(due)
+
     def _request_status_for_registry(self, *, force: bool = False) -> None:
-        for house, room, node in registry.iter_nodes():
-            node_id = node.get("id")
-            if node_id:
-                self._request_motion_status(str(node_id), force=force)
+        self._request_motion_statuses(
+            (
+                str(node["id"])
+                for _house, _room, node in registry.iter_nodes()
+                if node.get("id")
+            ),
+            force=force,
+        )
 
     def _seed_room_sensors_from_config(self) -> None:
-        for node_id in list(self.config.keys()):
+        node_ids = list(self.config.keys())
+        for node_id in node_ids:
             self._ensure_room_sensor_entry(node_id)
-            self._request_motion_status(node_id, force=True)
+        self._request_motion_statuses(node_ids, force=True)
 
     def _handle_status_message(self, node_id: str, msg: mqtt.MQTTMessage) -> None:
         payload = self._decode_json(msg.payload)
@@ -571,8 +628,15 @@ class MotionManager:
         if active is not None:
             entry["active"] = active
 
-    def _record_motion_event(self, node_id: str, sensor: str, payload: bytes) -> None:
-        node_entry = self._ensure_room_sensor_entry(node_id)
+    def _record_motion_event(
+        self,
+        node_id: str,
+        sensor: str,
+        payload: bytes,
+        *,
+        location: Optional[_NodeLocation] = None,
+    ) -> None:
+        node_entry = self._ensure_room_sensor_entry(node_id, location=location)
         if not node_entry:
             return
         sensors = node_entry.setdefault("sensors", {})
@@ -599,19 +663,15 @@ class MotionManager:
                     entry["last_detected"] = entry["last_event"]
 
     def _normalize_sensor_payload(self, payload: Any) -> Dict[str, Any]:
-        data: Any = None
-        if isinstance(payload, dict):
-            data = dict(payload)
+        if not isinstance(payload, dict):
+            return {"active": self._normalize_active_value(payload), "data": payload}
         active: Optional[bool] = None
-        if isinstance(payload, dict):
-            for key in ("active", "state", "status", "value", "motion", "present"):
-                if key in payload:
-                    active = self._normalize_active_value(payload[key])
-                    if active is not None:
-                        break
-        else:
-            active = self._normalize_active_value(payload)
-        return {"active": active, "data": data if data is not None else payload}
+        for key in _SENSOR_ACTIVE_KEYS:
+            if key in payload:
+                active = self._normalize_active_value(payload[key])
+                if active is not None:
+                    break
+        return {"active": active, "data": dict(payload)}
 
     def _normalize_active_value(self, value: Any) -> Optional[bool]:
         if isinstance(value, bool):
@@ -619,73 +679,33 @@ class MotionManager:
         if isinstance(value, (int, float)):
             return bool(value)
         if isinstance(value, str):
-            text = value.strip().lower()
-            if text in {
-                "1",
-                "true",
-                "yes",
-                "on",
-                "active",
-                "motion",
-                "motion_detected",
-                "motion_detect",
-                "detected",
-            }:
-                return True
-            if text in {
-                "0",
-                "false",
-                "no",
-                "off",
-                "inactive",
-                "clear",
-                "motion_clear",
-                "none",
-            }:
-                return False
+            return _ACTIVE_WORDS.get(value.strip().lower())
         return None
 
     def _extract_sensor_states(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         sensors: Dict[str, Any] = {}
-        raw_sensors = payload.get("sensors")
-        if isinstance(raw_sensors, dict):
-            for key, value in raw_sensors.items():
-                sensors[str(key)] = value
-        modules = payload.get("modules")
-        if isinstance(modules, dict):
-            motion_state = modules.get("motion")
-            if isinstance(motion_state, dict):
-                module_sensors = motion_state.get("sensors")
-                if isinstance(module_sensors, dict):
-                    for key, value in module_sensors.items():
-                        sensors.setdefault(str(key), value)
-        motion = payload.get("motion")
-        if isinstance(motion, dict):
-            for key, value in motion.items():
-                sensors.setdefault(str(key), value)
-        sensor_info = payload.get("sensor")
-        if isinstance(sensor_info, dict):
-            sensor_id = sensor_info.get("id") or sensor_info.get("sid")
-            if sensor_id:
-                sensors.setdefault(str(sensor_id), sensor_info)
+        for key, extract in _SENSOR_SOURCES:
+            found = extract(payload.get(key))
+            if not found:
+                continue
+            for sensor_id, value in found.items():
+                if type(sensor_id) is not str:
+                    sensor_id = str(sensor_id)
+                if sensor_id not in sensors:
+                    sensors[sensor_id] = value
         sid = payload.get("sid")
-        state = payload.get("state")
-        if sid is not None and state is not None:
+        if sid is not None and payload.get("state") is not None:
             sensors.setdefault(str(sid), payload)
         if "pir" in payload and "pir" not in sensors:
-            sensors["pir"] = payload.get("pir")
+            sensors["pir"] = payload["pir"]
         return sensors
 
     def _decode_json(self, payload: bytes) -> Any:
-        try:
-            text = payload.decode("utf-8")
-        except Exception:
-            return None
-        if not text:
+        if not payload:
             return None
         try:
-            return json.loads(text)
-        except Exception:
+            return json_codec.loads(payload)
+        except ValueError:
             return None
 
     def _apply_motion_preset(
@@ -733,8 +753,15 @@ class MotionManager:
         *,
         config: Optional[Dict[str, Any]] = None,
         request_status: bool = True,
+        location: Optional[_NodeLocation] = None,
     ) -> Optional[Dict[str, Any]]:
-        house, room, node = registry.find_node(node_id)
+        """Return the room sensor entry for ``node_id``, creating it if needed.
+
+        Callers that already looked the node up pass ``location`` (the
+        ``registry.find_node`` result) so the registry is not searched twice.
+        """
+
+        house, room, node = location or registry.find_node(node_id)
         if not house or not room or not node:
             return None
         house_id = house.get("id")
@@ -2,17 +2,26 @@
 
 The :class:`MotionPreferencesStore` keeps track of per-room node immunity
 settings for motion automation.  Immunity is represented as the set of node IDs
-that should be ignored whenever a motion preset is applied.
+that should be ignored whenever a motion preset is applied.  Each room's set is
+a ``frozenset`` inside a copy-on-write snapshot that writers replace
+wholesale, so readers on the motion hot path neither lock nor copy.  Changes
+are written to disk shortly after they are made, off the request thread (see
+:class:`DebouncedSave`).
 """
 
 from __future__ import annotations
 
-import json
+import atexit
 import threading
 from pathlib import Path
-from typing import Dict, Iterable, Set
+from typing import Dict, FrozenSet, Iterable, Set
 
+from . import json_codec
 from .config import settings
+from .persistence import DebouncedSave, write_atomic
+
+
+_EMPTY: FrozenSet[str] = frozenset()
 
 
 class MotionPreferencesStore:
@@ -20,18 +29,21 @@ class MotionPreferencesStore:
 
     def __init__(self, path: Path) -> None:
         self.path = path
-        self._lock = threading.RLock()
+        # Serializes writers only; readers use whatever ``_data`` snapshot is bound.
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
         self._data = self._load()
+        self._pending_save = DebouncedSave(self.save)
 
-    def _load(self) -> Dict[str, Dict[str, Set[str]]]:
+    def _load(self) -> Dict[str, Dict[str, FrozenSet[str]]]:
         if not self.path.exists():
             return {}
         try:
-            raw = json.loads(self.path.read_text())
+            raw = json_codec.loads(self.path.read_bytes())
         except Exception:
             return {}
 
-        data: Dict[str, Dict[str, Set[str]]] = {}
+        data: Dict[str, Dict[str, FrozenSet[str]]] = {}
         if not isinstance(raw, dict):
             return data
 
@@ -39,7 +51,7 @@ class MotionPreferencesStore:
             if not isinstance(rooms, dict):
                 continue
             house_key = str(house_id)
-            house_entry: Dict[str, Set[str]] = {}
+            house_entry: Dict[str, FrozenSet[str]] = {}
             for room_id, nodes in rooms.items():
                 node_set: Set[str] = set()
                 if isinstance(nodes, list):
@@ -53,126 +65,132 @@ class MotionPreferencesStore:
                         if node_text:
                             node_set.add(node_text)
                 if node_set:
-                    house_entry[str(room_id)] = node_set
+                    house_entry[str(room_id)] = frozenset(node_set)
             if house_entry:
                 data[house_key] = house_entry
         return data
 
     def _serialize(self) -> Dict[str, Dict[str, list[str]]]:
-        serialized: Dict[str, Dict[str, list[str]]] = {}
-        for house_id, rooms in self._data.items():
-            clean_rooms: Dict[str, list[str]] = {}
-            for room_id, nodes in rooms.items():
-                if not nodes:
-                    continue
-                clean_rooms[room_id] = sorted(nodes)
-            if clean_rooms:
-                serialized[house_id] = clean_rooms
-        return serialized
-
-    def _save_locked(self) -> None:
-        payload = json.dumps(self._serialize(), indent=2)
-        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path.write_text(payload)
-        tmp_path.replace(self.path)
+        return {
+            house_id: {room_id: sorted(nodes) for room_id, nodes in rooms.items()}
+            for house_id, rooms in self._data.items()
+        }
 
     def save(self) -> None:
-        with self._lock:
-            self._save_locked()
-
-    def get_room_immune_nodes(self, house_id: str, room_id: str) -> Set[str]:
-        house_key = str(house_id)
-        room_key = str(room_id)
-        with self._lock:
-            rooms = self._data.get(house_key)
-            if not rooms:
-                return set()
-            nodes = rooms.get(room_key)
-            if not nodes:
-                return set()
-            return set(nodes)
+        """Write the current preferences snapshot."""
+
+        with self._save_lock:
+            serialized = json_codec.dumps_pretty(self._serialize())
+            write_atomic(self.path, serialized)
+
+    def flush(self) -> None:
+        """Write any change still waiting for its deferred save."""
+
+        self._pending_save.flush()
+
+    def get_room_immune_nodes(self, house_id: str, room_id: str) -> FrozenSet[str]:
+        """Return the immune node ids of a room; the set is shared, not copied."""
+
+        data = self._data
+        if not data:
+            # Nothing configured anywhere: skip the key conversions entirely.
+            return _EMPTY
+        rooms = data.get(str(house_id))
+        if not rooms:
+            return _EMPTY
+        return rooms.get(str(room_id), _EMPTY)
+
+    def _replace_room_locked(
+        self, house_key: str, room_key: str, nodes: FrozenSet[str]
+    ) -> None:
+        """Publish a new snapshot with ``nodes`` as the room's immune set.
+
+        ``_data`` and the house dicts it holds are never mutated once
+        published: the touched house is copied, updated and swapped in with
+        a single rebind, so readers never need the lock.  Empty rooms and
+        houses are dropped.
+        """
+
+        data = dict(self._data)
+        rooms = dict(data.get(house_key, ()))
+        if nodes:
+            rooms[room_key] = nodes
+        else:
+            rooms.pop(room_key, None)
+        if rooms:
+            data[house_key] = rooms
+        else:
+            data.pop(house_key, None)
+        self._data = data
+        self._pending_save.schedule()
 
     def set_room_immune_nodes(
         self, house_id: str, room_id: str, nodes: Iterable[str]
-    ) -> Set[str]:
+    ) -> FrozenSet[str]:
         house_key = str(house_id)
         room_key = str(room_id)
-        clean: Set[str] = set()
-        for node in nodes:
-            node_text = str(node).strip()
-            if node_text:
-                clean.add(node_text)
+        clean = frozenset(
+            node_text for node_text in (str(node).strip() for node in nodes) if node_text
+        )
 
         with self._lock:
-            if not clean:
-                rooms = self._data.get(house_key)
-                if rooms and room_key in rooms:
-                    rooms.pop(room_key, None)
-                    if not rooms:
-                        self._data.pop(house_key, None)
-                    self._save_locked()
-                return set()
-
-            rooms = self._data.setdefault(house_key, {})
-            rooms[room_key] = set(clean)
-            self._save_locked()
-            return set(clean)
+            if clean or room_key in self._data.get(house_key, ()):
+                self._replace_room_locked(house_key, room_key, clean)
+        return clean or _EMPTY
 
     def add_room_immune_node(
         self, house_id: str, room_id: str, node_id: str
-    ) -> Set[str]:
+    ) -> FrozenSet[str]:
         node_key = str(node_id).strip()
         if not node_key:
             return self.get_room_immune_nodes(house_id, room_id)
+        house_key = str(house_id)
+        room_key = str(room_id)
         with self._lock:
-            rooms = self._data.setdefault(str(house_id), {})
-            nodes = rooms.setdefault(str(room_id), set())
-            nodes.add(node_key)
-            self._save_locked()
-            return set(nodes)
+            nodes = self.get_room_immune_nodes(house_key, room_key) | {node_key}
+            self._replace_room_locked(house_key, room_key, nodes)
+            return nodes
 
     def remove_room_immune_node(
         self, house_id: str, room_id: str, node_id: str
-    ) -> Set[str]:
+    ) -> FrozenSet[str]:
         node_key = str(node_id).strip()
+        house_key = str(house_id)
+        room_key = str(room_id)
         with self._lock:
-            rooms = self._data.get(str(house_id))
-            if not rooms:
-                return set()
-            nodes = rooms.get(str(room_id))
-            if not nodes or node_key not in nodes:
-                return set(nodes or set())
-            nodes.discard(node_key)
-            if not nodes:
-                rooms.pop(str(room_id), None)
-            if not rooms:
-                self._data.pop(str(house_id), None)
-            self._save_locked()
-            return set(nodes)
+            nodes = self.get_room_immune_nodes(house_key, room_key)
+            if node_key not in nodes:
+                return nodes
+            nodes = nodes - {node_key}
+            self._replace_room_locked(house_key, room_key, nodes)
+            return nodes
 
     def remove_node(self, node_id: str) -> None:
+        if not self._data:
+            return
         node_key = str(node_id).strip()
         if not node_key:
             return
-        changed = False
         with self._lock:
-            for house_id in list(self._data.keys()):
-                rooms = self._data[house_id]
-                for room_id in list(rooms.keys()):
-                    nodes = rooms[room_id]
-                    if node_key in nodes:
-                        nodes.discard(node_key)
-                        changed = True
-                    if not nodes:
-                        rooms.pop(room_id, None)
-                        changed = True
-                if not rooms:
-                    self._data.pop(house_id, None)
-                    changed = True
+            data: Dict[str, Dict[str, FrozenSet[str]]] = {}
+            changed = False
+            for house_id, rooms in self._data.items():
+                if not any(node_key in nodes for nodes in rooms.values()):
+                    data[house_id] = rooms
+                    continue
+                changed = True
+                kept = {
+                    room_id: nodes - {node_key}
+                    for room_id, nodes in rooms.items()
+                    if nodes != {node_key}
+                }
+                if kept:
+                    data[house_id] = kept
             if changed:
-                self._save_locked()
+                self._data = data
+                self._pending_save.schedule()
 
 
 motion_preferences = MotionPreferencesStore(settings.MOTION_PREFS_FILE)
+atexit.register(motion_preferences.flush)
 
@@ -1,13 +1,20 @@
-import json
+import logging
 import threading
 import time
-from typing import Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import paho.mqtt.client as paho
 
+from . import json_codec
 from .mqtt_tls import connect_mqtt_client
 
+logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=4096)
 def topic_cmd(node_id: str, path: str) -> str:
     return f"ul/{node_id}/cmd/{path}"
 
@@ -16,7 +23,7 @@ NODE_COMMAND_RATE_HZ = 5.0
 NODE_COMMAND_INTERVAL = 1.0 / NODE_COMMAND_RATE_HZ
 
 
-PendingCommand = Tuple[str, str, bool]
+PendingCommand = Tuple[str, bytes, bool]
 
 
 class MqttBus:
@@ -37,6 +44,13 @@ class MqttBus:
         )
         self._node_next_publish: Dict[str, float] = {}
         self._pending_commands: Dict[str, PendingCommand] = {}
+        # Commands that bypass the per-node rate limit, keyed by topic.  They
+        # are still handed to the worker thread so request handlers never block
+        # inside paho; a newer command for a topic that has not been sent yet
+        # replaces the older one and takes its place at the back of the queue,
+        # so commands still go out in the order they were last issued.
+        self._immediate_commands: "OrderedDict[str, PendingCommand]" = OrderedDict()
+        self._publishing = False
         self._rate_condition = threading.Condition()
         self._shutdown = False
         self._rate_thread: Optional[threading.Thread] = None
@@ -72,28 +86,88 @@ class MqttBus:
 
         When ``rate_limited`` is ``True`` (the default), commands destined for a
         specific node are throttled so firmware is not flooded.  Setting
-        ``rate_limited`` to ``False`` bypasses the queue entirely so commands
-        publish immediately.
+        ``rate_limited`` to ``False`` bypasses the throttle so commands are
+        published as soon as the worker thread picks them up, ahead of any
+        throttled commands; repeated commands to a topic that is still queued
+        collapse into the latest one.  Either way the caller only pays for a
+        queue insert.
+        """
+        command = (topic, json_codec.dumps(payload), retain)
+        with self._rate_condition:
+            self._enqueue_locked(command, rate_limited)
+            self._rate_condition.notify_all()
+
+    def pub_many(
+        self,
+        topics: Iterable[str],
+        payload: Dict[str, object],
+        retain: bool = False,
+        rate_limited: bool = True,
+    ) -> None:
+        """Publish the same ``payload`` to every topic in ``topics``.
+
+        The payload is encoded once and all commands are queued under a
+        single lock acquisition; unthrottled ones are then handed to paho by
+        the worker back to back.  Queuing semantics match :meth:`pub`.
         """
+
+        data = json_codec.dumps(payload)
+        with self._rate_condition:
+            for topic in topics:
+                self._enqueue_locked((topic, data, retain), rate_limited)
+            self._rate_condition.notify_all()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Hold back the worker while several commands are queued.
+
+        Commands issued inside the block (through :meth:`pub` or the
+        ``*_set`` helpers) are all queued before the worker can pick any of
+        them up, so unthrottled ones reach paho back to back in one pass
+        instead of waking the worker once per command.
+        """
+
+        with self._rate_condition:
+            yield
+
+    def _enqueue_locked(self, command: PendingCommand, rate_limited: bool) -> None:
+        topic = command[0]
         node_id = self._node_from_topic(topic)
-        payload_json = json.dumps(payload)
-        if not node_id:
-            self.client.publish(topic, payload=payload_json, qos=1, retain=retain)
-            return
-        if not rate_limited:
-            with self._rate_condition:
+        if node_id and rate_limited:
+            self._pending_commands[node_id] = command
+        else:
+            if node_id:
                 self._pending_commands.pop(node_id, None)
-            self.client.publish(topic, payload=payload_json, qos=1, retain=retain)
-            return
+            self._immediate_commands.pop(topic, None)
+            self._immediate_commands[topic] = command
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every unthrottled command has been handed to paho."""
+
+        deadline = time.monotonic() + timeout
         with self._rate_condition:
-            self._pending_commands[node_id] = (topic, payload_json, retain)
-            self._rate_condition.notify()
+            while self._immediate_commands or self._publishing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._shutdown:
+                    return False
+                self._rate_condition.wait(timeout=remaining)
+        return True
 
     def _rate_worker(self) -> None:
         while True:
-            command: Optional[PendingCommand] = None
+            commands: List[PendingCommand] = []
             with self._rate_condition:
-                while not self._shutdown and command is None:
+                self._publishing = False
+                self._rate_condition.notify_all()
+                while not commands:
+                    if self._immediate_commands:
+                        # Take every unthrottled command so a burst (e.g. a
+                        # room's motion-off fan-out) is published in one pass.
+                        commands.extend(self._immediate_commands.values())
+                        self._immediate_commands.clear()
+                        break
+                    if self._shutdown:
+                        return
                     now = time.monotonic()
                     ready_node: Optional[str] = None
                     next_ready_time: Optional[float] = None
@@ -105,7 +179,7 @@ class MqttBus:
                         if next_ready_time is None or node_ready < next_ready_time:
                             next_ready_time = node_ready
                     if ready_node is not None:
-                        command = self._pending_commands.pop(ready_node)
+                        commands.append(self._pending_commands.pop(ready_node))
                         self._node_next_publish[ready_node] = now + NODE_COMMAND_INTERVAL
                         break
                     if not self._pending_commands:
@@ -118,12 +192,12 @@ class MqttBus:
                                 max(0.0, next_ready_time - now),
                             )
                         self._rate_condition.wait(timeout=wait_time)
-                if self._shutdown:
-                    return
-            if command is None:
-                continue
-            topic, payload, retain = command
-            self.client.publish(topic, payload=payload, qos=1, retain=retain)
+                self._publishing = True
+            for topic, payload, retain in commands:
+                try:
+                    self.client.publish(topic, payload=payload, qos=1, retain=retain)
+                except Exception:
+                    logger.exception("Failed to publish MQTT command to %s", topic)
 
     @staticmethod
     def _node_from_topic(topic: str) -> Optional[str]:
@@ -136,6 +210,10 @@ class MqttBus:
         with self._rate_condition:
             self._shutdown = True
             self._rate_condition.notify_all()
+        # Let the worker hand any unthrottled commands to paho before the
+        # network loop goes away.
+        if self._rate_thread is not None:
+            self._rate_thread.join(timeout=5.0)
         try:
             if self._loop_running:
                 loop_stop = getattr(self.client, "loop_stop", None)
@@ -145,8 +223,6 @@ class MqttBus:
             self.client.disconnect()
         except Exception:
             pass
-        if self._rate_thread is not None:
-            self._rate_thread.join(timeout=5.0)
         if self._loop_thread is not None:
             self._loop_thread.join(timeout=5.0)
 
@@ -234,6 +310,18 @@ class MqttBus:
             rate_limited=rate_limited,
         )
 
+    def motion_status_request_many(
+        self, node_ids: Iterable[str], *, rate_limited: bool = False
+    ) -> None:
+        """Request the PIR sensor status from several nodes in one batch."""
+
+        self.pub_many(
+            (topic_cmd(node_id, "pir/status") for node_id in node_ids),
+            {},
+            retain=False,
+            rate_limited=rate_limited,
+        )
+
     def motion_on(self, node_id: str) -> None:
         """Cancel any in-progress motion fade on ``node_id``."""
         self.pub(
@@ -253,6 +341,16 @@ class MqttBus:
             rate_limited=False,
         )
 
+    def motion_off_many(self, node_ids: Iterable[str], payload: Dict[str, object]) -> None:
+        """Publish the same motion clear command to several nodes at once."""
+
+        self.pub_many(
+            (topic_cmd(node_id, "motion/off") for node_id in node_ids),
+            payload,
+            retain=False,
+            rate_limited=False,
+        )
+
     def status_request(self, node_id: str) -> None:
         """Request a full status snapshot from ``node_id``."""
         self.pub(topic_cmd(node_id, "status"), {}, retain=False)
@@ -331,8 +331,13 @@ def ensure_for_node(
     assigned_house_id: Optional[int] = None,
     assigned_user_id: Optional[int] = None,
     hardware_metadata: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
 ) -> NodeCredentialWithToken:
-    """Ensure a credential row exists for ``node_id`` and return it."""
+    """Ensure a credential row exists for ``node_id`` and return it.
+
+    With ``commit=False`` changes are only flushed, leaving the caller to
+    commit them as part of a larger transaction.
+    """
     plaintext: Optional[str] = None
     registration = _get_registration_by_node_id(session, node_id)
     registration_changed = False
@@ -440,7 +445,9 @@ def ensure_for_node(
         session.add(registration)
     if credential_changed:
         session.add(credential)
-    if registration_changed or credential_changed:
+    if (registration_changed or credential_changed) and not commit:
+        session.flush()
+    elif registration_changed or credential_changed:
         session.commit()
         if registration_changed:
             session.refresh(registration)
@@ -1037,8 +1044,12 @@ def list_unprovisioned_registrations(session: Session) -> List[NodeRegistration]
     ).all()
 
 
-def sync_registry_nodes(session: Session) -> None:
-    """Ensure every registry node has a credential entry and synced download id."""
+def sync_registry_nodes(session: Session, *, commit: bool = True) -> None:
+    """Ensure every registry node has a credential entry and synced download id.
+
+    With ``commit=False`` changes are only flushed so the caller can commit
+    them together with its own work.
+    """
     registry.ensure_house_external_ids(persist=False)
 
     changed = False
@@ -1084,6 +1095,7 @@ def sync_registry_nodes(session: Session) -> None:
             display_name=display_name,
             download_id=download_id if not existing_download else None,
             token_hash=token_hash if not existing_token else None,
+            commit=commit,
         )
 
         credential = ensured.credential
@@ -1099,7 +1111,7 @@ def sync_registry_nodes(session: Session) -> None:
         registry.save_registry()
 
 
-def migrate_credentials_to_registrations(session: Session) -> int:
+def migrate_credentials_to_registrations(session: Session, *, commit: bool = True) -> int:
     """Ensure every legacy credential has a backing registration."""
     created = 0
     updated = 0
@@ -1179,7 +1191,10 @@ def migrate_credentials_to_registrations(session: Session) -> int:
                 updated += 1
 
     if created or updated:
-        session.commit()
+        if commit:
+            session.commit()
+        else:
+            session.flush()
 
     return created
 
@@ -0,0 +1,403 @@
+"""Helpers shared by the small JSON-backed preference stores."""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from . import json_codec
+from .scheduling import DeadlineScheduler, ScheduledCall
+
+
+logger = logging.getLogger(__name__)
+
+# Delay between the first unsaved change and the write that persists it.
+STORE_SAVE_DELAY_SECONDS = 0.1
+# A journal is folded back into its snapshot once it outgrows both this and
+# ``JOURNAL_COMPACT_RATIO`` times the snapshot size.
+JOURNAL_COMPACT_MIN_BYTES = 64 * 1024
+JOURNAL_COMPACT_RATIO = 4
+
+# Deferred store saves from every store share one timer thread.
+_SAVE_SCHEDULER = DeadlineScheduler("store-saves")
+
+# Channel indices are small ints; their dict keys are looked up, not rebuilt.
+_CHANNEL_KEYS = tuple(sys.intern(str(index)) for index in range(256))
+
+
+def format_channel_key(channel: object) -> str:
+    """Return the string key a store uses for ``channel``."""
+
+    if type(channel) is int and 0 <= channel < 256:
+        return _CHANNEL_KEYS[channel]
+    return sys.intern(str(channel))
+
+
+# ``(node id, module, channel)`` key used by the flat channel stores.
+ChannelKey = Tuple[str, str, str]
+
+
+def intern_channel_key(node_id: object, module: object, channel: object) -> ChannelKey:
+    """Build a key to store, sharing one string object per distinct part.
+
+    Node ids and module names repeat across every channel entry; interning
+    them keeps a single copy each and lets lookups match by identity.
+    """
+
+    return (sys.intern(str(node_id)), sys.intern(str(module)), format_channel_key(channel))
+
+
+_V = TypeVar("_V")
+_S = TypeVar("_S")
+
+
+def nest_channel_values(
+    items: Iterable[Tuple[ChannelKey, _V]],
+) -> Dict[str, Dict[str, Dict[str, _V]]]:
+    """Group flat ``(node, module, channel) -> value`` pairs by node and module."""
+
+    nested: Dict[str, Dict[str, Dict[str, _V]]] = {}
+    for (node_key, module_key, channel_key), value in items:
+        nested.setdefault(node_key, {}).setdefault(module_key, {})[channel_key] = value
+    return nested
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` via a temporary file and rename.
+
+    ``data`` is written as-is through an unbuffered handle, so callers encode
+    their payload once and no text-layer copy is made.  The file and its
+    directory are fsynced so the new contents and the rename both survive a
+    crash before the caller discards anything (such as a journal) that the
+    snapshot supersedes.
+    """
+
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not _link_anonymous_file(path.parent, tmp_path, data):
+        with open(tmp_path, "wb", buffering=0) as handle:
+            _write_all(handle.fileno(), data)
+            os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+    _fsync_directory(path.parent)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view) :]
+
+
+def _link_anonymous_file(directory: Path, tmp_path: Path, data: bytes) -> bool:
+    """Write ``data`` to an unnamed ``O_TMPFILE`` inode and link it as ``tmp_path``.
+
+    The file only gets a name once it is complete and fsynced, so a crash
+    mid-write cannot leave a truncated ``.tmp`` file behind.  Returns False
+    where ``O_TMPFILE`` is unavailable (non-Linux, unsupported filesystem, no
+    ``/proc``) so the caller falls back to writing ``tmp_path`` directly.
+    """
+
+    flag = getattr(os, "O_TMPFILE", 0)
+    if not flag:
+        return False
+    try:
+        fd = os.open(directory, flag | os.O_WRONLY, 0o644)
+    except OSError:
+        return False
+    try:
+        _write_all(fd, data)
+        os.fsync(fd)
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(f"/proc/self/fd/{fd}", tmp_path)
+        except OSError:
+            return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _fsync_directory(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:  # pragma: no cover - e.g. directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - some filesystems reject directory fsync
+        pass
+    finally:
+        os.close(fd)
+
+
+class DebouncedSave:
+    """Coalesce bursts of ``schedule()`` calls into a single ``save()``.
+
+    The first call arms a timer on the shared save scheduler; further calls
+    before it fires are absorbed by the same write.  ``flush()`` performs any
+    pending save immediately and is registered at exit by the stores so
+    nothing is lost on shutdown.
+    """
+
+    def __init__(
+        self, save: Callable[[], None], delay: float = STORE_SAVE_DELAY_SECONDS
+    ) -> None:
+        self._save = save
+        self._delay = delay
+        self._lock = threading.Lock()
+        self._timer: Optional[ScheduledCall] = None
+
+    def schedule(self) -> None:
+        with self._lock:
+            if self._timer is None:
+                self._timer = _SAVE_SCHEDULER.call_later(self._delay, self._fire)
+
+    def _take_pending(self) -> bool:
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is None:
+            return False
+        timer.cancel()
+        return True
+
+    def _fire(self) -> None:
+        if not self._take_pending():
+            return
+        try:
+            self._save()
+        except Exception:  # pragma: no cover - logged for operators
+            logger.exception("Deferred store save failed")
+
+    def flush(self) -> None:
+        """Write any pending changes now."""
+
+        if self._take_pending():
+            self._save()
+
+
+class LazyStore(Generic[_S]):
+    """Proxy that builds a store the first time one of its attributes is used.
+
+    The module-level store singletons are wrapped in this so importing them
+    (e.g. during test collection or from CLI tools) reads nothing from disk.
+    """
+
+    def __init__(self, factory: Callable[[], _S]) -> None:
+        self._factory = factory
+        self._store: Optional[_S] = None
+        self._lock = threading.Lock()
+
+    def _get(self) -> _S:
+        store = self._store
+        if store is None:
+            with self._lock:
+                store = self._store
+                if store is None:
+                    store = self._store = self._factory()
+        return store
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def flush(self) -> None:
+        """Flush the store if it was ever loaded; never loads it."""
+
+        store = self._store
+        if store is not None:
+            store.flush()  # type: ignore[attr-defined]
+
+
+class JsonJournal:
+    """Append-only log of JSON records kept next to a store's snapshot.
+
+    ``append``/``extend`` only encode and enqueue their records; a daemon
+    writer thread drains the queue and writes everything that piled up with
+    a single unbuffered ``write``, so request threads never wait on disk and
+    bursts of updates share one syscall.  Callers must enqueue in the order
+    they apply changes (i.e. under their own lock) and call ``sync`` before
+    relying on records being on disk.
+
+    A crash can at worst leave a truncated final line, which ``replay``
+    skips.  Compaction first ``rotate``s the log aside, writes the snapshot
+    without holding the store lock, then ``discard_rotated``; a crash in
+    between only means the rotated records are replayed again, which is
+    harmless.  Records still queued during a rotation land in the new log
+    and are likewise re-applied on top of a snapshot that already has them.
+    """
+
+    def __init__(
+        self, path: Path, on_written: Optional[Callable[[], None]] = None
+    ) -> None:
+        self.path = path
+        # Called on the writer thread after each batch, e.g. to schedule compaction.
+        self._on_written = on_written
+        self.rotated_path = path.with_suffix(path.suffix + ".old")
+        self._handle: Optional[BinaryIO] = None
+        try:
+            self._size = path.stat().st_size
+        except OSError:
+            self._size = 0
+        # Encoded lines, or events to set once everything before them is written.
+        self._queue: "queue.SimpleQueue[Union[bytes, threading.Event]]" = (
+            queue.SimpleQueue()
+        )
+        self._io_lock = threading.Lock()
+        self._writer_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+    def replay(self) -> Iterator[Dict[str, Any]]:
+        for path in (self.rotated_path, self.path):
+            try:
+                raw = path.read_bytes()
+            except OSError:
+                continue
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = json_codec.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+    def append(self, record: Dict[str, Any]) -> None:
+        self.extend((record,))
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Queue several records to be written together."""
+
+        data = b"".join(json_codec.dumps(record) + b"\n" for record in records)
+        if not data:
+            return
+        self._ensure_writer()
+        self._queue.put(data)
+
+    def sync(self) -> None:
+        """Block until every record queued so far has been written."""
+
+        if self._writer is None:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait()
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                writer = threading.Thread(
+                    target=self._run_writer,
+                    name=f"journal-writer:{self.path.name}",
+                    daemon=True,
+                )
+                writer.start()
+                self._writer = writer
+
+    def _run_writer(self) -> None:
+        while True:
+            chunks: List[bytes] = []
+            waiters: List[threading.Event] = []
+            item = self._queue.get()
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    chunks.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if chunks:
+                try:
+                    self._write(b"".join(chunks))
+                    if self._on_written is not None:
+                        self._on_written()
+                except Exception:  # pragma: no cover - logged for operators
+                    logger.exception("Journal write to %s failed", self.path)
+            for waiter in waiters:
+                waiter.set()
+
+    def _write(self, data: bytes) -> None:
+        with self._io_lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = open(self.path, "ab", buffering=0)
+                if self._size and not self._ends_with_newline():
+                    # Terminate a torn record so it cannot swallow the next one.
+                    self._handle.write(b"\n")
+                    self._size += 1
+            self._handle.write(data)
+            self._size += len(data)
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            return handle.read(1) == b"\n"
+
+    def should_compact(self, snapshot_size: int) -> bool:
+        return self._size > max(
+            JOURNAL_COMPACT_MIN_BYTES, JOURNAL_COMPACT_RATIO * snapshot_size
+        )
+
+    def rotate(self) -> None:
+        """Move the written records aside and start an empty log."""
+
+        with self._io_lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if self._size:
+                if self.rotated_path.exists():
+                    # An earlier compaction failed; keep its records first.
+                    with open(self.rotated_path, "ab") as rotated:
+                        rotated.write(self.path.read_bytes())
+                    os.unlink(self.path)
+                else:
+                    os.replace(self.path, self.rotated_path)
+            self._size = 0
+
+    def discard_rotated(self) -> None:
+        """Drop rotated records once a snapshot containing them is durable."""
+
+        try:
+            os.unlink(self.rotated_path)
+        except FileNotFoundError:
+            pass
+
+
+__all__ = [
+    "ChannelKey",
+    "DebouncedSave",
+    "JOURNAL_COMPACT_MIN_BYTES",
+    "JOURNAL_COMPACT_RATIO",
+    "JsonJournal",
+    "LazyStore",
+    "STORE_SAVE_DELAY_SECONDS",
+    "format_channel_key",
+    "intern_channel_key",
+    "nest_channel_values",
+    "write_atomic",
+]
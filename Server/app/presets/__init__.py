@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from contextlib import nullcontext
 from copy import deepcopy
 from typing import Any, Dict, Iterable, List, Optional
 
@@ -142,43 +143,47 @@ def apply_preset(bus: MqttBus, preset: Dict[str, Any]) -> None:
     if not isinstance(actions, list):
         return
 
-    for raw_action in actions:
-        if not isinstance(raw_action, dict):
-            continue
-
-        module_raw = raw_action.get("module")
-        node_raw = raw_action.get("node")
-        module = str(module_raw).strip().lower() if module_raw is not None else ""
-        node = str(node_raw).strip() if node_raw is not None else ""
-        if not module or not node:
-            continue
-
-        effect_raw = raw_action.get("effect")
-        effect = str(effect_raw) if effect_raw is not None else ""
-        brightness = _coerce_int(raw_action.get("brightness"), default=0)
-
-        if module == "ws":
-            strip = _coerce_int(raw_action.get("strip"), default=0)
-            params = _normalize_sequence(raw_action.get("params"))
-            bus.ws_set(node, strip, effect, brightness, params, rate_limited=False)
-        elif module == "rgb":
-            strip = _coerce_int(raw_action.get("strip"), default=0)
-            params = _normalize_rgb_params(raw_action.get("params"))
-            bus.rgb_set(node, strip, effect, brightness, params, rate_limited=False)
-        elif module == "white":
-            channel = _coerce_int(raw_action.get("channel"), default=0)
-            params = _normalize_sequence(raw_action.get("params"))
-            bus.white_set(
-                node,
-                channel,
-                effect,
-                brightness,
-                params,
-                rate_limited=False,
-            )
-        else:
-            # Unknown action type; ignore for now.
-            continue
+    # Queue every command before the bus worker sends any, so a preset's
+    # commands go out together in one pass.
+    batch = getattr(bus, "batch", None)
+    with batch() if batch is not None else nullcontext():
+        for raw_action in actions:
+            if not isinstance(raw_action, dict):
+                continue
+
+            module_raw = raw_action.get("module")
+            node_raw = raw_action.get("node")
+            module = str(module_raw).strip().lower() if module_raw is not None else ""
+            node = str(node_raw).strip() if node_raw is not None else ""
+            if not module or not node:
+                continue
+
+            effect_raw = raw_action.get("effect")
+            effect = str(effect_raw) if effect_raw is not None else ""
+            brightness = _coerce_int(raw_action.get("brightness"), default=0)
+
+            if module == "ws":
+                strip = _coerce_int(raw_action.get("strip"), default=0)
+                params = _normalize_sequence(raw_action.get("params"))
+                bus.ws_set(node, strip, effect, brightness, params, rate_limited=False)
+            elif module == "rgb":
+                strip = _coerce_int(raw_action.get("strip"), default=0)
+                params = _normalize_rgb_params(raw_action.get("params"))
+                bus.rgb_set(node, strip, effect, brightness, params, rate_limited=False)
+            elif module == "white":
+                channel = _coerce_int(raw_action.get("channel"), default=0)
+                params = _normalize_sequence(raw_action.get("params"))
+                bus.white_set(
+                    node,
+                    channel,
+                    effect,
+                    brightness,
+                    params,
+                    rate_limited=False,
+                )
+            else:
+                # Unknown action type; ignore for now.
+                continue
 
 
 def _normalize_custom_preset(preset: Dict[str, Any]) -> Dict[str, Any]:
@@ -90,6 +90,7 @@ def generate_node_id(length: Optional[int] = None) -> str:
 
 def save_registry() -> None:
     """Persist the in-memory registry to ``REGISTRY_FILE``."""
+    _registry_changed()
     settings.REGISTRY_FILE.write_text(
         json.dumps(settings.DEVICE_REGISTRY, indent=2)
     )
@@ -263,6 +264,9 @@ def find_house(house_id: str) -> Optional[House]:
 def get_house_external_id(house: House) -> str:
     """Return the public identifier for ``house``."""
 
+    external_id = house.get("external_id")
+    if isinstance(external_id, str) and external_id:
+        return external_id
     ensure_house_external_ids(persist=False)
     external_id = house.get("external_id")
     if isinstance(external_id, str) and external_id:
@@ -287,31 +291,133 @@ def require_house(house_id: str) -> Tuple[House, str]:
     return house, get_house_slug(house)
 
 
+# id(rooms list) -> (rooms list, room id -> position).  Holding the list keeps
+# its id from being reused while the entry exists.
+_ROOM_INDEX: Dict[int, Tuple[List[Room], Dict[str, int]]] = {}
+_ROOM_INDEX_LIMIT = 256
+
+
+def get_room(house: House, room_id: str) -> Optional[Room]:
+    """Return the room ``room_id`` of ``house`` using a cached position index.
+
+    A cached position is only trusted when the list still holds a room with
+    that id at that position; any other outcome rebuilds the index, so in-place
+    registry edits never return a stale room.
+    """
+
+    rooms = house.get("rooms")
+    if not isinstance(rooms, list):
+        return None
+    cached = _ROOM_INDEX.get(id(rooms))
+    if cached is not None and cached[0] is rooms:
+        position = cached[1].get(room_id)
+        if position is not None and position < len(rooms):
+            room = rooms[position]
+            if isinstance(room, dict) and room.get("id") == room_id:
+                return room
+
+    index: Dict[str, int] = {}
+    for position, room in enumerate(rooms):
+        if isinstance(room, dict):
+            identifier = room.get("id")
+            if isinstance(identifier, str):
+                index.setdefault(identifier, position)
+    if len(_ROOM_INDEX) >= _ROOM_INDEX_LIMIT:
+        _ROOM_INDEX.clear()
+    _ROOM_INDEX[id(rooms)] = (rooms, index)
+    position = index.get(room_id)
+    return rooms[position] if position is not None else None
+
+
 def find_room(house_id: str, room_id: str) -> Tuple[Optional[House], Optional[Room]]:
     house = find_house(house_id)
     if not house:
         return None, None
-    for room in house.get("rooms", []):
-        if room.get("id") == room_id:
-            return house, room
-    return house, None
+    return house, get_room(house, room_id)
 
 
-def find_node(node_id: str) -> Tuple[Optional[House], Optional[Room], Optional[Node]]:
-    """Return ``(house, room, node)`` for ``node_id`` if present in the registry."""
+# Registry list and node id -> (house, room or None, node) positions.  Room
+# position None marks a node listed directly on the house (unassigned).
+_NodePosition = Tuple[int, Optional[int], int]
+# Bumped whenever nodes may have been added to the registry; the node index
+# records the generation it was built at so a lookup miss can be trusted.
+_REGISTRY_GENERATION = 0
+_NODE_INDEX: Tuple[Optional[Registry], int, Dict[str, _NodePosition]] = (None, -1, {})
 
-    for house in settings.DEVICE_REGISTRY:
+
+def _registry_changed() -> None:
+    global _REGISTRY_GENERATION
+    _REGISTRY_GENERATION += 1
+
+
+def _node_at(
+    registry: Registry, node_id: str, position: _NodePosition
+) -> Optional[Tuple[House, Optional[Room], Node]]:
+    house_pos, room_pos, node_pos = position
+    try:
+        house = registry[house_pos]
+        if room_pos is None:
+            room = None
+            node = house.get("nodes")[node_pos]
+        else:
+            room = house.get("rooms")[room_pos]
+            node = room.get("nodes")[node_pos]
+    except (AttributeError, IndexError, KeyError, TypeError):
+        return None
+    if isinstance(node, dict) and node.get("id") == node_id:
+        return house, room, node
+    return None
+
+
+def _build_node_index(registry: Registry) -> Dict[str, _NodePosition]:
+    index: Dict[str, _NodePosition] = {}
+    for house_pos, house in enumerate(registry):
         if not isinstance(house, dict):
             continue
-        for room in house.get("rooms", []) or []:
+        for room_pos, room in enumerate(house.get("rooms", []) or []):
             if not isinstance(room, dict):
                 continue
-            for node in room.get("nodes", []) or []:
-                if isinstance(node, dict) and node.get("id") == node_id:
-                    return house, room, node
-        for node in house.get("nodes", []) or []:
-            if isinstance(node, dict) and node.get("id") == node_id:
-                return house, None, node
+            for node_pos, node in enumerate(room.get("nodes", []) or []):
+                if isinstance(node, dict):
+                    index.setdefault(node.get("id"), (house_pos, room_pos, node_pos))
+        for node_pos, node in enumerate(house.get("nodes", []) or []):
+            if isinstance(node, dict):
+                index.setdefault(node.get("id"), (house_pos, None, node_pos))
+    return index
+
+
+def find_node(node_id: str) -> Tuple[Optional[House], Optional[Room], Optional[Node]]:
+    """Return ``(house, room, node)`` for ``node_id`` if present in the registry.
+
+    Positions come from a cached index that, like the room index, is only
+    trusted when the registry still holds a node with that id at that spot;
+    otherwise it is rebuilt, so nodes moved or removed in place are always
+    seen.  A miss is answered from the index while the registry object and
+    generation are unchanged, so messages from unknown nodes do not rebuild
+    it; the helpers that add nodes bump the generation.
+    """
+
+    global _NODE_INDEX
+
+    registry = settings.DEVICE_REGISTRY
+    indexed, generation, index = _NODE_INDEX
+    if indexed is registry:
+        position = index.get(node_id)
+        if position is None:
+            if generation == _REGISTRY_GENERATION:
+                return None, None, None
+        else:
+            found = _node_at(registry, node_id, position)
+            if found is not None:
+                return found
+
+    index = _build_node_index(registry)
+    _NODE_INDEX = (registry, _REGISTRY_GENERATION, index)
+    position = index.get(node_id)
+    if position is not None:
+        found = _node_at(registry, node_id, position)
+        if found is not None:
+            return found
     return None, None, None
 
 
@@ -581,6 +687,7 @@ def place_node_in_room(
             nodes_in_target.pop(index)
 
     nodes_in_target.append(node_entry)
+    _registry_changed()
 
     if persist and settings.DEVICE_REGISTRY is not None:
         save_registry()
@@ -704,6 +811,7 @@ def move_node_to_unassigned(
         if isinstance(entry, dict) and entry.get("id") == node_id:
             orphan_nodes.pop(idx)
     orphan_nodes.append(node_entry)
+    _registry_changed()
 
     if persist and settings.DEVICE_REGISTRY is not None:
         save_registry()
@@ -0,0 +1,24 @@
+"""Response classes shared by the API routers."""
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from . import json_codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """``JSONResponse`` encoded with :mod:`json_codec`.
+
+    Uses ``orjson`` when it is installed instead of the standard library
+    encoder Starlette defaults to.  Routes that declare a ``response_model``
+    are better served by FastAPI's own Pydantic serialization and should keep
+    the default response class.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
+
+
+__all__ = ["CodecJSONResponse"]
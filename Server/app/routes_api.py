@@ -1,10 +1,11 @@
 from datetime import datetime, timezone
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
 from .mqtt_bus import MqttBus
 from . import node_credentials, registry
 from .auth.access import AccessPolicy, HouseContext
@@ -29,9 +30,11 @@ from .brightness_curve import brightness_curve_store, brightness_curve_applicato
 from .channel_names import channel_names
 from .config import settings
 from .database import get_session
+from .responses import CodecJSONResponse
 
 
-router = APIRouter()
+# Handlers return plain dicts, so encode them with orjson when available.
+router = APIRouter(default_response_class=CodecJSONResponse)
 logger = logging.getLogger(__name__)
 BUS: Optional[MqttBus] = None
 
@@ -154,10 +157,12 @@ def _valid_node(node_id: str) -> Dict[str, Any]:
     raise HTTPException(404, "Unknown node id")
 
 
-def _normalize_limits(raw_limits: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+def _normalize_limits(
+    raw_limits: Mapping[str, Mapping[str, int]],
+) -> Dict[str, Dict[str, int]]:
     cleaned: Dict[str, Dict[str, int]] = {}
     for module, channels in raw_limits.items():
-        if not isinstance(channels, dict):
+        if not isinstance(channels, Mapping):
             continue
         module_key = str(module)
         module_limits: Dict[str, int] = {}
@@ -179,7 +184,7 @@ def _normalize_light_entries(
     limits: Dict[str, int],
     *,
     include_color: bool = False,
-    names: Optional[Dict[str, str]] = None,
+    names: Optional[Mapping[str, str]] = None,
 ) -> Dict[str, Dict[str, Any]]:
     result: Dict[str, Dict[str, Any]] = {}
     if not isinstance(items, list):
@@ -228,7 +233,7 @@ def _normalize_light_entries(
             clean_name = raw_name.strip()
             if clean_name:
                 name_value = clean_name
-        if isinstance(names, dict):
+        if isinstance(names, Mapping):
             stored = names.get(str(index))
             if isinstance(stored, str):
                 clean_stored = stored.strip()
@@ -1338,24 +1343,16 @@ def api_rgb_set(
     return {"ok": True}
 
 
-@router.post("/api/node/{node_id}/{module}/brightness-limit")
-def api_set_brightness_limit(
-    node_id: str,
-    module: str,
-    payload: Dict[str, Any],
-    *,
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session),
-):
-    policy = _build_policy(session, current_user)
-    node_ctx = _require_node(policy, node_id)
-    _ensure_can_manage_house(node_ctx.room.house, current_user)
-    node = node_ctx.node
+def _require_channel_module(node: Dict[str, Any], module: str) -> str:
     module_key = str(module).lower()
     if module_key not in {"ws", "white", "rgb"}:
         raise HTTPException(404, "unsupported module")
     if module_key not in node.get("modules", []):
         raise HTTPException(404, "module not available")
+    return module_key
+
+
+def _parse_brightness_limit(payload: Mapping[str, Any]) -> tuple[int, Optional[int]]:
     try:
         channel = int(payload.get("channel"))
     except Exception:
@@ -1364,18 +1361,66 @@ def api_set_brightness_limit(
         raise HTTPException(400, "invalid channel")
     limit = payload.get("limit")
     if limit is None:
-        brightness_limits.set_limit(node_id, module_key, channel, None)
-        return {"ok": True, "limit": None}
+        return channel, None
     try:
         value = int(limit)
     except Exception:
         raise HTTPException(400, "invalid limit")
     if not 0 <= value <= 255:
         raise HTTPException(400, "invalid limit")
+    return channel, value
+
+
+@router.post("/api/node/{node_id}/{module}/brightness-limit")
+def api_set_brightness_limit(
+    node_id: str,
+    module: str,
+    payload: Dict[str, Any],
+    *,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    policy = _build_policy(session, current_user)
+    node_ctx = _require_node(policy, node_id)
+    _ensure_can_manage_house(node_ctx.room.house, current_user)
+    module_key = _require_channel_module(node_ctx.node, module)
+    channel, value = _parse_brightness_limit(payload)
     stored = brightness_limits.set_limit(node_id, module_key, channel, value)
     return {"ok": True, "limit": stored}
 
 
+@router.post("/api/node/{node_id}/{module}/brightness-limits")
+def api_set_brightness_limits(
+    node_id: str,
+    module: str,
+    payload: Dict[str, Any],
+    *,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Set several channel limits at once, e.g. when resetting a module."""
+
+    policy = _build_policy(session, current_user)
+    node_ctx = _require_node(policy, node_id)
+    _ensure_can_manage_house(node_ctx.room.house, current_user)
+    module_key = _require_channel_module(node_ctx.node, module)
+    entries = payload.get("limits")
+    if not isinstance(entries, list) or not all(isinstance(e, dict) for e in entries):
+        raise HTTPException(400, "invalid limits")
+    # Validate everything before storing anything.
+    updates = [
+        (node_id, module_key, *_parse_brightness_limit(entry)) for entry in entries
+    ]
+    stored = brightness_limits.set_limits_bulk(updates)
+    return {
+        "ok": True,
+        "limits": [
+            {"channel": channel, "limit": limit}
+            for (_, _, channel, _), limit in zip(updates, stored)
+        ],
+    }
+
+
 @router.post("/api/node/{node_id}/{module}/channel-name")
 def api_set_channel_name(
     node_id: str,
@@ -1388,12 +1433,7 @@ def api_set_channel_name(
     policy = _build_policy(session, current_user)
     node_ctx = _require_node(policy, node_id)
     _ensure_can_manage_house(node_ctx.room.house, current_user)
-    node = node_ctx.node
-    module_key = str(module).lower()
-    if module_key not in {"ws", "white", "rgb"}:
-        raise HTTPException(404, "unsupported module")
-    if module_key not in node.get("modules", []):
-        raise HTTPException(404, "module not available")
+    module_key = _require_channel_module(node_ctx.node, module)
     try:
         channel = int(payload.get("channel"))
     except Exception:
@@ -1448,14 +1488,16 @@ def api_ota_check(
 
 
 @router.get("/api/node/{node_id}/state")
-def api_node_state(
+async def api_node_state(
     node_id: str,
     timeout: float = 3.0,
     *,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    policy = _build_policy(session, current_user)
+    # Only the policy lookup touches the database; the snapshot wait below is
+    # awaited on the event loop so it does not hold a threadpool worker.
+    policy = await run_in_threadpool(_build_policy, session, current_user)
     node_ctx = _require_node(policy, node_id)
     node = node_ctx.node
     try:
@@ -1465,15 +1507,9 @@ def api_node_state(
     if timeout_value != timeout_value or timeout_value <= 0:
         raise HTTPException(400, "timeout must be positive")
 
-    info = status_monitor.status_for(node_id)
-    since_seq_raw = info.get("seq") if isinstance(info, dict) else 0
-    try:
-        since_seq = int(since_seq_raw)
-    except (TypeError, ValueError):
-        since_seq = 0
-
-    get_bus().status_request(node_id)
-    seq, payload = status_monitor.wait_for_snapshot(node_id, since_seq, timeout_value)
+    seq, payload = await status_monitor.request_snapshot(
+        node_id, lambda: get_bus().status_request(node_id), timeout_value
+    )
     if not isinstance(payload, dict) or payload.get("event") != "snapshot":
         raise HTTPException(504, "Timed out waiting for status snapshot")
 
@@ -1490,18 +1526,13 @@ def api_node_status(node_id: str):
             return None
         return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
 
-    signal_value: Optional[float] = None
-    signal = info.get("signal_dbi")
-    if isinstance(signal, (int, float)):
-        signal_value = float(signal)
-
     return {
         "node": node_id,
         "online": bool(info.get("online")),
         "status": info.get("status"),
         "last_ok": _iso(info.get("last_ok")),
         "last_seen": _iso(info.get("last_seen")),
-        "signal_dbi": signal_value,
+        "signal_dbi": info.get("signal_dbi"),
         "timeout": status_monitor.timeout,
         "now": datetime.now(timezone.utc).isoformat(),
     }
@@ -1542,17 +1573,14 @@ def api_admin_status(
             continue
         node_id = node["id"]
         info = snapshot.get(node_id, {})
-        signal_value: Optional[float] = None
-        signal = info.get("signal_dbi")
-        if isinstance(signal, (int, float)):
-            signal_value = float(signal)
         nodes[node_id] = {
             "online": bool(info.get("online")),
             "last_ok": _iso(info.get("last_ok")),
             "last_seen": _iso(info.get("last_seen")),
             "last_snapshot": _iso(info.get("last_snapshot")),
             "status": info.get("status"),
-            "signal_dbi": signal_value,
+            # Already normalised to a float (or None) by the status monitor.
+            "signal_dbi": info.get("signal_dbi"),
         }
     now = datetime.now(timezone.utc).isoformat()
     return {"now": now, "timeout": status_monitor.timeout, "nodes": nodes}
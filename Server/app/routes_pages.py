@@ -1,11 +1,13 @@
 import logging
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from jinja2.utils import htmlsafe_json_dumps
+from markupsafe import Markup
 from sqlmodel import Session, select
 
 from . import node_builder, node_credentials, registry
@@ -61,6 +63,49 @@ NODE_MODULE_TEMPLATES = ["ws", "rgb", "white", "motion"]
 logger = logging.getLogger(__name__)
 
 
+def _build_ws_effect_groups() -> List[Dict[str, Any]]:
+    missing = [eff for eff in WS_EFFECTS if eff not in WS_PARAM_DEFS]
+    if missing:
+        logger.warning("WS_PARAM_DEFS missing entries for: %s", ", ".join(sorted(missing)))
+
+    tier_groups: dict[str, list[str]] = defaultdict(list)
+    for eff in sorted(WS_EFFECTS):
+        tier = WS_EFFECT_TIERS.get(eff, "standard")
+        tier_groups[tier].append(eff)
+
+    return [
+        {
+            "key": tier,
+            "label": WS_EFFECT_TIER_LABELS.get(tier, tier.replace("_", " ").title()),
+            "effects": names,
+        }
+        for tier, names in sorted(
+            tier_groups.items(),
+            key=lambda item: (WS_EFFECT_TIER_ORDER.get(item[0], 99), item[0]),
+        )
+    ]
+
+
+def _param_defs_json(defs: Mapping[str, Any]) -> Markup:
+    # Same escaping as Jinja's ``tojson``; the frozen mappings become objects.
+    return htmlsafe_json_dumps(defs, default=dict)
+
+
+# The effect registries are fixed for the lifetime of the process, so the
+# effect-related part of the node page context is built once at import.
+_NODE_PAGE_EFFECT_CONTEXT: Dict[str, Any] = {
+    "ws_effects": WS_EFFECTS,
+    "ws_effect_groups": _build_ws_effect_groups(),
+    "ws_effect_tiers": WS_EFFECT_TIERS,
+    "white_effects": sorted(WHITE_EFFECTS),
+    "rgb_effects": sorted(RGB_EFFECTS),
+    # Serialized once here instead of via ``|tojson`` on every render.
+    "ws_param_defs_json": _param_defs_json(WS_PARAM_DEFS),
+    "white_param_defs_json": _param_defs_json(WHITE_PARAM_DEFS),
+    "rgb_param_defs_json": _param_defs_json(RGB_PARAM_DEFS),
+}
+
+
 def _require_current_user(
     request: Request,
     session: Session = Depends(get_session),
@@ -1165,28 +1210,6 @@ def node_page(
     else:
         subtitle = None
 
-    missing = [eff for eff in WS_EFFECTS if eff not in WS_PARAM_DEFS]
-    if missing:
-        import logging
-        logging.warning("WS_PARAM_DEFS missing entries for: %s", ", ".join(sorted(missing)))
-
-    tier_groups: dict[str, list[str]] = defaultdict(list)
-    for eff in sorted(WS_EFFECTS):
-        tier = WS_EFFECT_TIERS.get(eff, "standard")
-        tier_groups[tier].append(eff)
-
-    ws_effect_groups = [
-        {
-            "key": tier,
-            "label": WS_EFFECT_TIER_LABELS.get(tier, tier.replace("_", " ").title()),
-            "effects": names,
-        }
-        for tier, names in sorted(
-            tier_groups.items(),
-            key=lambda item: (WS_EFFECT_TIER_ORDER.get(item[0], 99), item[0]),
-        )
-    ]
-
     status_info = status_monitor.status_for(node["id"])
     status_initial_online = bool(status_info.get("online"))
 
@@ -1198,17 +1221,10 @@ def node_page(
             "node": node,
             "title": title,
             "subtitle": subtitle,
-            "ws_effects": WS_EFFECTS,
-            "ws_effect_groups": ws_effect_groups,
-            "ws_effect_tiers": WS_EFFECT_TIERS,
-            "white_effects": sorted(WHITE_EFFECTS),
-            "rgb_effects": sorted(RGB_EFFECTS),
-            "ws_param_defs": WS_PARAM_DEFS,
-            "white_param_defs": WHITE_PARAM_DEFS,
-            "rgb_param_defs": RGB_PARAM_DEFS,
+            **_NODE_PAGE_EFFECT_CONTEXT,
             "status_timeout": status_monitor.timeout,
             "status_initial_online": status_initial_online,
-            "brightness_limits": brightness_limits.get_limits_for_node(node["id"]),
+            "brightness_limits": brightness_limits.get_limits_for_node_mutable(node["id"]),
             "module_templates": NODE_MODULE_TEMPLATES,
             **nav_context,
         },
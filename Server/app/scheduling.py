@@ -0,0 +1,84 @@
+"""Run callbacks at monotonic deadlines from a single background thread."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduledCall:
+    """Handle for a pending callback; ``cancel()`` mirrors ``threading.Timer``."""
+
+    __slots__ = ("deadline", "func", "args", "cancelled")
+
+    def __init__(
+        self, deadline: float, func: Callable[..., Any], args: Tuple[Any, ...]
+    ) -> None:
+        self.deadline = deadline
+        self.func = func
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        # Cancelled entries stay in the heap and are skipped when they expire.
+        self.cancelled = True
+
+
+class DeadlineScheduler:
+    """Min-heap of deadlines served by one daemon thread.
+
+    Scheduling or cancelling is a heap push or a flag flip instead of
+    creating (and later tearing down) a thread per callback as
+    ``threading.Timer`` does.  Callbacks run one at a time on the scheduler
+    thread, so they should not block for long.
+    """
+
+    def __init__(self, name: str = "deadline-scheduler") -> None:
+        self._name = name
+        self._heap: List[Tuple[float, int, ScheduledCall]] = []
+        self._seq = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def call_later(self, delay: float, func: Callable[..., Any], *args: Any) -> ScheduledCall:
+        deadline = time.monotonic() + max(0.0, delay)
+        call = ScheduledCall(deadline, func, args)
+        with self._condition:
+            heapq.heappush(self._heap, (deadline, next(self._seq), call))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is call:
+                # New earliest deadline: wake the thread to shorten its wait.
+                self._condition.notify()
+        return call
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    remaining = self._heap[0][0] - time.monotonic()
+                    if remaining <= 0:
+                        call = heapq.heappop(self._heap)[2]
+                        break
+                    self._condition.wait(remaining)
+            if call.cancelled:
+                continue
+            try:
+                call.func(*call.args)
+            except Exception:  # pragma: no cover - logged for operators
+                logger.exception("Scheduled callback %r failed", call.func)
+
+
+__all__ = ["DeadlineScheduler", "ScheduledCall"]
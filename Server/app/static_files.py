@@ -0,0 +1,156 @@
+"""Static file serving with browser cache headers and precompressed variants."""
+from __future__ import annotations
+
+import gzip
+import logging
+import mimetypes
+import os
+import re
+import stat
+from pathlib import Path
+from typing import Optional, Tuple
+
+import anyio
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised when brotli is missing
+    brotli = None  # type: ignore[assignment]
+
+
+logger = logging.getLogger(__name__)
+
+# ``name.<hex digest>.ext`` (or its ``.br``/``.gz`` variant) – the URL
+# changes whenever the content does.
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{8,}\.[^./]+(\.br|\.gz)?$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_SUFFIXES = frozenset({".css", ".html", ".js", ".json", ".svg"})
+# Preferred first: (Accept-Encoding token, file suffix).
+_ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _compress(data: bytes, suffix: str) -> Optional[bytes]:
+    if suffix == ".gz":
+        # mtime=0 keeps the output stable, so unchanged assets keep their ETag.
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        return brotli.compress(data, quality=11)
+    return None
+
+
+def precompress_static(directory: Path) -> None:
+    """Write ``.br``/``.gz`` siblings for text assets that lack fresh ones.
+
+    Brotli variants need the optional ``brotli`` package; without it only
+    gzip files are produced.  Variants that would not be smaller are skipped,
+    and an out-of-date sibling that is not rewritten is removed so it is
+    never served in place of the changed source.
+    """
+
+    for source in directory.rglob("*"):
+        if source.suffix not in COMPRESSIBLE_SUFFIXES or not source.is_file():
+            continue
+        source_mtime = source.stat().st_mtime
+        data: Optional[bytes] = None
+        for _, suffix in _ENCODINGS:
+            target = source.with_name(source.name + suffix)
+            if target.exists() and target.stat().st_mtime >= source_mtime:
+                continue
+            if data is None:
+                data = source.read_bytes()
+            compressed = _compress(data, suffix)
+            if compressed is not None and len(compressed) < len(data):
+                try:
+                    target.write_bytes(compressed)
+                    continue
+                except OSError:
+                    logger.warning("Unable to write precompressed asset %s", target)
+            _remove_stale(target)
+
+
+def _remove_stale(target: Path) -> None:
+    try:
+        target.unlink()
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.warning("Unable to remove stale precompressed asset %s", target)
+
+
+def _accepted_encodings(scope: Scope) -> frozenset[str]:
+    accepted = set()
+    for part in Headers(scope=scope).get("accept-encoding", "").split(","):
+        token, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(token.strip().lower())
+    return frozenset(accepted)
+
+
+class CachingStaticFiles(StaticFiles):
+    """``StaticFiles`` that tells browsers how long assets may be reused.
+
+    Content-hashed files are cached for a year.  Everything else must be
+    revalidated, which Starlette answers with a 304 when the ``ETag`` still
+    matches, so repeat page loads only pay for a round trip.  Text assets are
+    served from their precompressed ``.br``/``.gz`` sibling when the client
+    accepts that encoding (see :func:`precompress_static`).
+    """
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope["method"] in ("GET", "HEAD") and Path(path).suffix in COMPRESSIBLE_SUFFIXES:
+            accepted = _accepted_encodings(scope)
+            for encoding, suffix in _ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    full_path, stat_result = await anyio.to_thread.run_sync(
+                        self.lookup_path, path + suffix
+                    )
+                except (OSError, ValueError):
+                    break
+                if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+                    continue
+                response = self.file_response(full_path, stat_result, scope)
+                media_type = mimetypes.guess_type(path)[0] or "text/plain"
+                if media_type.startswith("text/"):
+                    media_type += "; charset=utf-8"
+                response.headers["Content-Type"] = media_type
+                response.headers["Content-Encoding"] = encoding
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+        response = await super().get_response(path, scope)
+        if Path(path).suffix in COMPRESSIBLE_SUFFIXES:
+            response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    def file_response(
+        self,
+        full_path: str | os.PathLike[str],
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if _HASHED_NAME.search(os.fspath(full_path)):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return response
+
+
+__all__ = ["CachingStaticFiles", "precompress_static"]
@@ -1,15 +1,20 @@
 """Track node heartbeat/status messages from MQTT."""
 from __future__ import annotations
 
-import json
+import asyncio
 import threading
 import time
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import paho.mqtt.client as mqtt
 
+from . import json_codec
 from .mqtt_tls import connect_mqtt_client
 
+# Snapshots younger than this are served from memory instead of asking the
+# node again; pushed ``evt/status`` snapshots keep the cache warm.
+SNAPSHOT_CACHE_TTL = 0.5
+
 
 class StatusMonitor:
     """Subscribe to node status topics and track their last "ok" heartbeat."""
@@ -28,7 +33,17 @@ class StatusMonitor:
         self._last_ok: Dict[str, float] = {}
         self._last_snapshot: Dict[str, float] = {}
         self._last_payload: Dict[str, Any] = {}
+        # Raw bytes behind ``_last_payload`` so repeated identical messages
+        # (the common heartbeat case) reuse the parsed payload.
+        self._last_raw: Dict[str, bytes] = {}
         self._node_seq: Dict[str, int] = {}
+        # node_id -> [(loop, future)] awaiting the next snapshot.  Futures are
+        # resolved from the MQTT network thread via ``call_soon_threadsafe``.
+        self._snapshot_waiters: Dict[
+            str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]]
+        ] = {}
+        # Nodes with a status request already published and not yet answered.
+        self._snapshot_requests: Set[str] = set()
         self._running = False
         self._loop_thread: Optional[threading.Thread] = None
 
@@ -80,77 +95,94 @@ class StatusMonitor:
             return
         node_id = parts[1]
         now = time.time()
+        raw = msg.payload
         payload: Any = None
-        try:
-            payload = json.loads(msg.payload.decode("utf-8"))
-        except Exception:
-            payload = None
+        if raw == self._last_raw.get(node_id):
+            payload = self._last_payload.get(node_id)
+        else:
+            try:
+                payload = json_codec.loads(raw)
+            except Exception:
+                payload = None
         status_value: Any = None
         if isinstance(payload, dict):
             status_value = payload.get("status")
+        is_snapshot = isinstance(payload, dict) and payload.get("event") == "snapshot"
+        waiters = None
         with self._lock:
             self._last_seen[node_id] = now
             self._last_payload[node_id] = payload
-            if isinstance(payload, dict) and payload.get("event") == "snapshot":
+            self._last_raw[node_id] = raw
+            if is_snapshot:
                 self._last_snapshot[node_id] = now
             if status_value == "ok":
                 self._last_ok[node_id] = now
             seq = self._node_seq.get(node_id, 0) + 1
             self._node_seq[node_id] = seq
+            if is_snapshot:
+                waiters = self._snapshot_waiters.pop(node_id, None)
+                self._snapshot_requests.discard(node_id)
             self._condition.notify_all()
+        if waiters:
+            for loop, future in waiters:
+                loop.call_soon_threadsafe(_resolve_future, future, (seq, payload))
 
     # ------------------------------------------------------------------
     # Public helpers
+    def _status_entry_locked(self, node_id: str, now: float) -> Dict[str, Any]:
+        last_seen = self._last_seen.get(node_id)
+        last_ok = self._last_ok.get(node_id)
+        last_snapshot = self._last_snapshot.get(node_id)
+        payload = self._last_payload.get(node_id)
+        status_value = None
+        signal_value = None
+        if isinstance(payload, dict):
+            status_value = payload.get("status")
+            signal = payload.get("signal_dbi")
+            if isinstance(signal, (int, float)):
+                signal_value = float(signal)
+        online_by_status = bool(last_ok and now - last_ok <= self.timeout)
+        online_by_snapshot = bool(
+            last_snapshot and now - last_snapshot <= self.timeout
+        )
+        return {
+            "online": online_by_status or online_by_snapshot,
+            "last_seen": last_seen,
+            "last_ok": last_ok,
+            "last_snapshot": last_snapshot,
+            "status": status_value,
+            "signal_dbi": signal_value,
+            "payload": payload,
+            "seq": self._node_seq.get(node_id, 0),
+        }
+
     def snapshot(self) -> Dict[str, Dict[str, Any]]:
         """Return a shallow copy of the current status information."""
         now = time.time()
         with self._lock:
             keys = set(self._last_seen) | set(self._last_ok) | set(self._last_snapshot)
-            data: Dict[str, Dict[str, Any]] = {}
-            for node_id in keys:
-                last_seen = self._last_seen.get(node_id)
-                last_ok = self._last_ok.get(node_id)
-                last_snapshot = self._last_snapshot.get(node_id)
-                payload = self._last_payload.get(node_id)
-                status_value = None
-                signal_value = None
-                if isinstance(payload, dict):
-                    status_value = payload.get("status")
-                    signal = payload.get("signal_dbi")
-                    if isinstance(signal, (int, float)):
-                        signal_value = float(signal)
-                online_by_status = bool(last_ok and now - last_ok <= self.timeout)
-                online_by_snapshot = bool(
-                    last_snapshot and now - last_snapshot <= self.timeout
-                )
-                data[node_id] = {
-                    "online": online_by_status or online_by_snapshot,
-                    "last_seen": last_seen,
-                    "last_ok": last_ok,
-                    "last_snapshot": last_snapshot,
-                    "status": status_value,
-                    "signal_dbi": signal_value,
-                    "payload": payload,
-                    "seq": self._node_seq.get(node_id, 0),
-                }
-        return data
+            return {node_id: self._status_entry_locked(node_id, now) for node_id in keys}
 
     def status_for(self, node_id: str) -> Dict[str, Any]:
         """Return status information for ``node_id``."""
-        snapshot = self.snapshot()
-        return snapshot.get(
-            node_id,
-            {
-                "online": False,
-                "last_seen": None,
-                "last_ok": None,
-                "last_snapshot": None,
-                "status": None,
-                "signal_dbi": None,
-                "payload": None,
-                "seq": 0,
-            },
-        )
+        now = time.time()
+        with self._lock:
+            if (
+                node_id in self._last_seen
+                or node_id in self._last_ok
+                or node_id in self._last_snapshot
+            ):
+                return self._status_entry_locked(node_id, now)
+        return {
+            "online": False,
+            "last_seen": None,
+            "last_ok": None,
+            "last_snapshot": None,
+            "status": None,
+            "signal_dbi": None,
+            "payload": None,
+            "seq": 0,
+        }
 
     def forget(self, node_id: str) -> None:
         """Drop any cached status information for ``node_id``."""
@@ -159,6 +191,7 @@ class StatusMonitor:
             self._last_ok.pop(node_id, None)
             self._last_snapshot.pop(node_id, None)
             self._last_payload.pop(node_id, None)
+            self._last_raw.pop(node_id, None)
             self._node_seq.pop(node_id, None)
 
     def wait_for_snapshot(
@@ -196,5 +229,75 @@ class StatusMonitor:
 
                 self._condition.wait(timeout=remaining)
 
+    async def request_snapshot(
+        self,
+        node_id: str,
+        publish: Callable[[], None],
+        timeout: float,
+        *,
+        max_age: float = SNAPSHOT_CACHE_TTL,
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        """Request a fresh snapshot from ``node_id`` and await it.
+
+        A snapshot received within the last ``max_age`` seconds is returned
+        without a broker round-trip.  Otherwise concurrent callers for the same
+        node share one in-flight request: only the first invokes ``publish``
+        and the rest await the same snapshot.
+        """
+
+        if max_age > 0:
+            with self._lock:
+                last_snapshot = self._last_snapshot.get(node_id)
+                payload = self._last_payload.get(node_id)
+                if (
+                    last_snapshot is not None
+                    and time.time() - last_snapshot < max_age
+                    and isinstance(payload, dict)
+                    and payload.get("event") == "snapshot"
+                ):
+                    return self._node_seq.get(node_id, 0), payload
+        return await self._await_snapshot(node_id, timeout, publish)
+
+    async def _await_snapshot(
+        self,
+        node_id: str,
+        timeout: float,
+        publish: Callable[[], None],
+    ) -> Tuple[int, Optional[Dict[str, Any]]]:
+        loop = asyncio.get_running_loop()
+        should_publish = False
+        with self._lock:
+            future: asyncio.Future = loop.create_future()
+            self._snapshot_waiters.setdefault(node_id, []).append((loop, future))
+            if node_id not in self._snapshot_requests:
+                self._snapshot_requests.add(node_id)
+                should_publish = True
+
+        try:
+            if should_publish:
+                publish()
+            return await asyncio.wait_for(future, max(0.0, float(timeout)))
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._drop_waiter_locked(node_id, future)
+                return self._node_seq.get(node_id, 0), None
+        except BaseException:
+            with self._lock:
+                self._drop_waiter_locked(node_id, future)
+            raise
+
+    def _drop_waiter_locked(self, node_id: str, future: asyncio.Future) -> None:
+        waiters = self._snapshot_waiters.get(node_id)
+        if waiters:
+            waiters[:] = [entry for entry in waiters if entry[1] is not future]
+        if not waiters:
+            self._snapshot_waiters.pop(node_id, None)
+            self._snapshot_requests.discard(node_id)
+
+
+def _resolve_future(future: asyncio.Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
 
 status_monitor = StatusMonitor()
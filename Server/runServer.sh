@@ -68,4 +68,13 @@ else
   echo "WARNING: MQTT monitor disabled (requires gnome-terminal or mosquitto_sub)" >&2
 fi
 
+# Refresh the effect tables generated from the firmware sources.
+python scripts/gen_effects.py
+
+# uvicorn[standard] ships uvloop and httptools; request them explicitly so a
+# missing extra fails loudly instead of silently falling back to asyncio/h11.
+# The app keeps MQTT clients, motion timers and status caches in-process, so it
+# must run as a single worker.
+OPTS+=(--loop "${WEB_LOOP:-uvloop}" --http "${WEB_HTTP:-httptools}")
+
 exec uvicorn app.main:app "${OPTS[@]}"
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Generate ``app/_effects_data.py`` from the firmware effect registries.
+
+``app.effects`` imports the generated module when it exists instead of
+scanning the firmware C sources on every start.  The module records the
+size and mtime of each source, so edited registries are rescanned until
+this is re-run (``runServer.sh`` does so on start-up).
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.effects import registry_stamps, scan_effects  # noqa: E402
+
+DEFAULT_OUTPUT = PROJECT_ROOT / "app" / "_effects_data.py"
+
+
+def render() -> str:
+    ws_tiers, white, rgb = scan_effects()
+    lines = [
+        '"""Effect names scanned from the firmware sources.',
+        "",
+        "Generated by scripts/gen_effects.py; do not edit.",
+        '"""',
+        "",
+        "# (mtime_ns, size) of each source; app.effects rescans when these differ.",
+        "SOURCE_STAMPS = {",
+        *(f"    {rel!r}: {stamp!r}," for rel, stamp in registry_stamps().items()),
+        "}",
+        "",
+        "WS_EFFECT_TIERS = {",
+        *(f"    {name!r}: {tier!r}," for name, tier in ws_tiers.items()),
+        "}",
+        "WHITE_EFFECTS = frozenset({",
+        *(f"    {name!r}," for name in sorted(white)),
+        "})",
+        "RGB_EFFECTS = frozenset({",
+        *(f"    {name!r}," for name in sorted(rgb)),
+        "})",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_OUTPUT,
+        help=f"file to write (default: {DEFAULT_OUTPUT})",
+    )
+    args = parser.parse_args(argv)
+    content = render()
+    if not args.output.exists() or args.output.read_text() != content:
+        args.output.write_text(content)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
+from typing import Iterator
 
+import pytest
 from sqlmodel import select
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -11,12 +13,32 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from app import registry
 from app import database as database_module
+from app.auth.access import AccessPolicy
 from app.auth.passwords import hash_password, verify_password
 from app.auth.service import create_user, init_auth_storage
 from app.auth.models import User
 from app.config import settings
 
 
+@pytest.fixture()
+def auth_db(tmp_path, monkeypatch) -> Iterator[None]:
+    """Initialise auth storage in a fresh SQLite file with a seeded admin."""
+
+    from app.auth import security
+
+    original_url = settings.AUTH_DB_URL
+    monkeypatch.setattr(settings, "INITIAL_ADMIN_USERNAME", "Seed-Admin")
+    monkeypatch.setattr(settings, "INITIAL_ADMIN_PASSWORD", "ultra-secret")
+    database_module.reset_session_factory(f"sqlite:///{Path(tmp_path) / 'auth.sqlite3'}")
+    security.reset_verification_cache()
+    try:
+        init_auth_storage()
+        yield
+    finally:
+        security.reset_verification_cache()
+        database_module.reset_session_factory(original_url)
+
+
 def test_hash_and_verify_password() -> None:
     password = "s3cret-value"
     hashed = hash_password(password)
@@ -25,6 +47,21 @@ def test_hash_and_verify_password() -> None:
     assert not verify_password("wrong", hashed)
 
 
+def test_hash_and_verify_password_in_worker_processes(monkeypatch) -> None:
+    from app.auth import security
+
+    monkeypatch.setattr(settings, "BCRYPT_USE_SUBPROCESSES", True)
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    try:
+        hashed = security.hash_password("pooled-secret")
+        assert security._bcrypt_pool is not None
+        assert security.verify_password("pooled-secret", hashed)
+        assert not security.verify_password("wrong", hashed)
+    finally:
+        security.shutdown_bcrypt_pool()
+    assert security._bcrypt_pool is None
+
+
 def test_init_auth_storage_seeds_admin(tmp_path, monkeypatch) -> None:
     original_url = settings.AUTH_DB_URL
     db_path = Path(tmp_path) / "auth.sqlite3"
@@ -70,3 +107,99 @@ def test_generate_house_external_ids_random_and_unique(monkeypatch) -> None:
 
     unchanged = registry.ensure_house_external_ids(sample_registry, persist=False)
     assert unchanged is False
+
+
+def test_access_policy_reused_until_session_writes(auth_db) -> None:
+    with database_module.SessionLocal() as session:
+        guest = create_user(session, "policy-guest", "guest-pass")
+
+        first = AccessPolicy.from_session(session, guest)
+        assert AccessPolicy.from_session(session, guest) is first
+
+        create_user(session, "policy-other", "other-pass")
+        assert AccessPolicy.from_session(session, guest) is not first
+
+
+def test_authenticate_user_caches_verification_until_hash_changes(
+    auth_db, monkeypatch
+) -> None:
+    from app.auth import security
+
+    calls: list[str] = []
+    real_verify = security.verify_password
+
+    def _counting_verify(password: str, hashed_password: str) -> bool:
+        calls.append(password)
+        return real_verify(password, hashed_password)
+
+    monkeypatch.setattr(security, "verify_password", _counting_verify)
+    with database_module.SessionLocal() as session:
+        user = create_user(session, "cache-user", "first-pass")
+
+        assert security.authenticate_user(session, "cache-user", "first-pass") is not None
+        assert security.authenticate_user(session, "cache-user", "first-pass") is not None
+        assert security.authenticate_user(session, "cache-user", "wrong") is None
+        assert security.authenticate_user(session, "cache-user", "wrong") is None
+        assert calls == ["first-pass", "wrong"]
+
+        user.hashed_password = hash_password("second-pass")
+        session.add(user)
+        session.commit()
+
+        assert security.authenticate_user(session, "cache-user", "first-pass") is None
+        assert security.authenticate_user(session, "cache-user", "second-pass") is not None
+
+
+def test_authenticate_unknown_user_still_runs_bcrypt(auth_db, monkeypatch) -> None:
+    from app.auth import security
+
+    checked: list[str] = []
+    real_verify = security.verify_password
+
+    def _recording_verify(password: str, hashed_password: str) -> bool:
+        checked.append(hashed_password)
+        return real_verify(password, hashed_password)
+
+    monkeypatch.setattr(security, "verify_password", _recording_verify)
+    with database_module.SessionLocal() as session:
+        assert security.authenticate_user(session, "nobody", "guess") is None
+    assert checked == [security._dummy_hash()]
+
+
+def test_session_token_round_trip_and_tampering() -> None:
+    from app.auth import security
+
+    user = User(id=42, username="token-user", hashed_password="x")
+    token = security.create_session_token(user)
+
+    data = security.verify_session_token(token)
+    assert data is not None
+    assert data.user_id == 42
+    assert data.username == "token-user"
+    assert not data.is_expired
+
+    payload_b64, signature_b64 = token.split(".")
+    payload = bytearray(security._b64decode(payload_b64))
+    payload[0] ^= 0x01
+    forged = f"{security._b64encode(bytes(payload))}.{signature_b64}"
+    assert security.verify_session_token(forged) is None
+    assert security.verify_session_token(payload_b64[:-4] + "." + signature_b64) is None
+
+
+def test_session_tokens_carry_a_raw_random_nonce() -> None:
+    from app.auth import security
+
+    user = User(id=7, username="nonce-user", hashed_password="x")
+    first = security.create_session_token(user)
+    second = security.create_session_token(user)
+    assert first != second
+
+    header_size = security._TOKEN_HEADER.size
+    nonces = {
+        security._b64decode(token.split(".")[0])[
+            header_size : security._TOKEN_PREFIX_SIZE
+        ]
+        for token in (first, second)
+    }
+    assert len(nonces) == 2
+    assert all(len(nonce) == security._TOKEN_NONCE_BYTES for nonce in nonces)
@@ -462,3 +462,45 @@ def test_server_admin_cannot_remove_self_when_others_exist(
     assert response.status_code == 400
     detail = response.json()["detail"]
     assert "own account" in detail
+
+
+def test_house_admin_sets_brightness_limits_in_bulk(
+    client: TestClient, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    import app.routes_api
+    from app.brightness_limits import BrightnessLimitsStore
+
+    store = BrightnessLimitsStore(tmp_path / "limits.json")
+    monkeypatch.setattr(app.routes_api, "brightness_limits", store)
+    _create_user(
+        "manager",
+        "house-pass",
+        memberships=[("alpha-public", HouseRole.ADMIN, None)],
+    )
+    _login(client, "manager", "house-pass")
+    url = "/api/node/alpha-node/white/brightness-limits"
+
+    response = client.post(
+        url, json={"limits": [{"channel": 0, "limit": 120}, {"channel": 1, "limit": None}]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "ok": True,
+        "limits": [{"channel": 0, "limit": 120}, {"channel": 1, "limit": None}],
+    }
+    assert store.get_limits_for_node_mutable("alpha-node") == {"white": {"0": 120}}
+
+    # One invalid entry rejects the whole request before anything is stored.
+    rejected = client.post(
+        url, json={"limits": [{"channel": 0, "limit": 10}, {"channel": 9, "limit": 10}]}
+    )
+    assert rejected.status_code == 400
+    assert store.get_limit("alpha-node", "white", 0) == 120
+
+    for module in ("ws", "bogus"):
+        missing = client.post(
+            f"/api/node/alpha-node/{module}/brightness-limits",
+            json={"limits": [{"channel": 0, "limit": 10}]},
+        )
+        assert missing.status_code == 404
+    assert store.get_limits_for_node_mutable("alpha-node") == {"white": {"0": 120}}
@@ -175,3 +175,24 @@ def test_login_rate_limit_blocks_and_expires(client: TestClient) -> None:
         follow_redirects=False,
     )
     assert recovery.status_code == 303
+
+
+def test_cached_user_refreshed_after_role_change(client: TestClient) -> None:
+    user, _ = _create_user("promoted-user", "promote-me")
+
+    response = client.post(
+        "/login",
+        data={"username": "promoted-user", "password": "promote-me"},
+        follow_redirects=False,
+    )
+    assert response.status_code == 303
+    assert client.get("/server-admin").status_code == 403
+
+    with database_module.SessionLocal() as session:
+        stored = session.get(User, user.id)
+        assert stored is not None
+        stored.server_admin = True
+        session.add(stored)
+        session.commit()
+
+    assert client.get("/server-admin").status_code == 200
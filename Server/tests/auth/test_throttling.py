@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.auth import throttling
+from app.auth.throttling import LoginRateLimiter, RedisLoginRateLimiter
+from app.config import settings
+
+
+class _FakeRedis:
+    """In-memory stand-in for the few Redis calls the limiter makes.
+
+    Keys expire against a manually advanced millisecond clock, and the
+    registered failure script is emulated command for command.
+    """
+
+    def __init__(self) -> None:
+        self.now_ms = 0
+        self.values: Dict[str, Tuple[int, Optional[int]]] = {}
+        self.scripts: List[str] = []
+
+    def _live(self, key: str) -> Optional[Tuple[int, Optional[int]]]:
+        entry = self.values.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= self.now_ms:
+            del self.values[key]
+            return None
+        return entry
+
+    def pttl(self, key: str) -> int:
+        entry = self._live(key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return entry[1] - self.now_ms
+
+    def delete(self, *keys: str) -> int:
+        return sum(self.values.pop(key, None) is not None for key in keys)
+
+    def register_script(self, script: str) -> Any:
+        self.scripts.append(script)
+        return self._register_failure
+
+    def _register_failure(self, *, keys: List[str], args: List[int]) -> List[int]:
+        failures, blocked = keys
+        window_ms, limit, block_ms = (int(arg) for arg in args)
+        retry_ms = self.pttl(blocked)
+        if retry_ms > 0:
+            return [1, retry_ms]
+        entry = self._live(failures)
+        count = (entry[0] if entry else 0) + 1
+        expiry = entry[1] if entry else self.now_ms + window_ms
+        self.values[failures] = (count, expiry)
+        if count >= limit:
+            self.delete(failures)
+            self.values[blocked] = (1, self.now_ms + block_ms)
+            return [1, block_ms]
+        return [0, 0]
+
+
+def _limiter(client: _FakeRedis) -> RedisLoginRateLimiter:
+    return RedisLoginRateLimiter(
+        client, max_attempts=3, window_seconds=60, block_seconds=120
+    )
+
+
+def test_redis_limiter_counts_failures_and_blocks() -> None:
+    client = _FakeRedis()
+    limiter = _limiter(client)
+    assert client.scripts == [throttling._REDIS_FAILURE_SCRIPT]
+
+    assert not limiter.register_failure("alice").blocked
+    assert not limiter.register_failure("alice").blocked
+    assert not limiter.status("alice").blocked
+
+    state = limiter.register_failure("alice")
+    assert state.blocked and state.retry_after == 120
+    assert "ul:login:alice:failures" not in client.values
+
+    client.now_ms += 30_500
+    assert limiter.status("alice").retry_after == 89
+    assert limiter.register_failure("alice").retry_after == 89
+    # Other identifiers keep their own budget.
+    assert not limiter.status("bob").blocked
+
+    client.now_ms += 90_000
+    assert not limiter.status("alice").blocked
+    assert not limiter.register_failure("alice").blocked
+
+
+def test_redis_limiter_window_expires_and_success_resets() -> None:
+    client = _FakeRedis()
+    limiter = _limiter(client)
+
+    limiter.register_failure("alice")
+    limiter.register_failure("alice")
+    client.now_ms += 60_000
+    # The first two failures fell out of the window.
+    assert not limiter.register_failure("alice").blocked
+    assert not limiter.register_failure("alice").blocked
+
+    limiter.register_success("alice")
+    assert client.values == {}
+    assert not limiter.register_failure("alice").blocked
+
+    for _ in range(2):
+        limiter.register_failure("alice")
+    assert limiter.status("alice").blocked
+    limiter.register_success("alice")
+    assert not limiter.status("alice").blocked
+
+
+def test_redis_url_selects_redis_limiter(monkeypatch) -> None:
+    client = _FakeRedis()
+    urls: List[str] = []
+
+    def _from_url(url: str) -> _FakeRedis:
+        urls.append(url)
+        return client
+
+    monkeypatch.setattr(
+        throttling, "redis", SimpleNamespace(Redis=SimpleNamespace(from_url=_from_url))
+    )
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_REDIS_URL", "redis://cache:6379/2")
+    try:
+        throttling.reset_login_rate_limiter()
+        limiter = throttling.get_login_rate_limiter()
+        assert isinstance(limiter, RedisLoginRateLimiter)
+        assert urls == ["redis://cache:6379/2"]
+
+        monkeypatch.setattr(throttling, "redis", None)
+        with pytest.raises(RuntimeError):
+            throttling.reset_login_rate_limiter()
+
+        monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_REDIS_URL", "")
+        throttling.reset_login_rate_limiter()
+        assert isinstance(throttling.get_login_rate_limiter(), LoginRateLimiter)
+    finally:
+        monkeypatch.undo()
+        throttling.reset_login_rate_limiter()
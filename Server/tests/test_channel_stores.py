@@ -0,0 +1,179 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import persistence
+from app.brightness_limits import BrightnessLimitsStore
+from app.channel_names import ChannelNameStore
+
+
+def test_limit_updates_are_journaled_and_replayed(tmp_path):
+    path = tmp_path / "limits.json"
+    store = BrightnessLimitsStore(path)
+
+    for channel in range(5):
+        store.set_limit("node-1", "ws", channel, 100 + channel)
+    store.set_limit("node-1", "ws", 4, None)
+    store.flush()
+
+    # Small journals are not compacted, so the snapshot is never rewritten.
+    assert not path.exists()
+    assert len((tmp_path / "limits.json.log").read_text().splitlines()) == 6
+
+    reloaded = BrightnessLimitsStore(path)
+    assert reloaded.get_limits_for_node("node-1") == {
+        "ws": {str(ch): 100 + ch for ch in range(4)}
+    }
+
+
+def test_journal_is_compacted_into_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, "JOURNAL_COMPACT_MIN_BYTES", 200)
+    path = tmp_path / "names.json"
+    log_path = tmp_path / "names.json.log"
+    store = ChannelNameStore(path)
+
+    for channel in range(10):
+        store.set_name("node-1", "white", channel, f"Lamp {channel}")
+    store.set_name("node-1", "white", 0, None)
+    store.flush()
+
+    assert json.loads(path.read_text())["node-1"]["white"]["9"] == "Lamp 9"
+    assert not log_path.exists() or log_path.stat().st_size < 200
+    assert not (tmp_path / "names.json.log.old").exists()
+
+    # A torn final line (e.g. after a crash) is ignored on replay.
+    with open(log_path, "ab") as handle:
+        handle.write(b'{"n":"node-1","m":"white","c":"3","v":"Par')
+
+    reloaded = ChannelNameStore(path)
+    names = reloaded.get_names_for_node("node-1")["white"]
+    assert "0" not in names
+    assert names["3"] == "Lamp 3"
+    assert len(names) == 9
+
+
+def test_node_view_is_reused_until_the_node_changes(tmp_path):
+    store = BrightnessLimitsStore(tmp_path / "limits.json")
+    store.set_limit("node-1", "white", 0, 80)
+    store.set_limit("node-2", "white", 0, 90)
+
+    first = store.get_limits_for_node("node-1")
+    assert store.get_limits_for_node("node-1") is first
+
+    other = store.get_limits_for_node("node-2")
+    store.set_limit("node-1", "white", 1, 40)
+    updated = store.get_limits_for_node("node-1")
+    assert updated is not first
+    assert updated == {"white": {"0": 80, "1": 40}}
+    assert store.get_limits_for_node("node-2") is other
+    assert store.get_limit("node-1", "white", 1) == 40
+
+    with pytest.raises(TypeError):
+        updated["white"]["0"] = 1  # type: ignore[index]
+    copy = store.get_limits_for_node_mutable("node-1")
+    copy["white"]["0"] = 1
+    assert store.get_limit("node-1", "white", 0) == 80
+
+
+def test_interrupted_compaction_replays_rotated_journal(tmp_path):
+    path = tmp_path / "limits.json"
+    store = BrightnessLimitsStore(path)
+    store.set_limit("node-1", "ws", 0, 10)
+    store.flush()
+    # Simulate a crash after the journal was rotated but before the
+    # snapshot was written.
+    store._journal.rotate()
+    store.set_limit("node-1", "ws", 1, 20)
+    store.flush()
+
+    reloaded = BrightnessLimitsStore(path)
+    assert reloaded.get_limits_for_node_mutable("node-1") == {"ws": {"0": 10, "1": 20}}
+
+    reloaded.save()
+    assert not (tmp_path / "limits.json.log.old").exists()
+    assert BrightnessLimitsStore(path).get_limit("node-1", "ws", 1) == 20
+
+
+def test_name_views_are_invalidated_per_node(tmp_path):
+    store = ChannelNameStore(tmp_path / "names.json")
+    store.set_name("node-1", "white", 0, "Desk")
+    store.set_name("node-2", "white", 0, "Shelf")
+
+    first = store.get_names_for_node("node-1")
+    other = store.get_names_for_node("node-2")
+    assert store.get_names_for_node("node-1") is first
+
+    # Clearing a name that is not set leaves the cached view alone.
+    store.set_name("node-1", "white", 5, "  ")
+    assert store.get_names_for_node("node-1") is first
+
+    store.set_name("node-1", "white", 0, None)
+    assert store.get_names_for_node("node-1") == {}
+    assert store.get_names_for_node("node-2") is other
+    assert store.get_names_for_node("missing") == {}
+
+
+def test_lazy_store_defers_loading_until_first_use(tmp_path):
+    path = tmp_path / "limits.json"
+    store = BrightnessLimitsStore(path)
+    store.set_limit("node-1", "white", 0, 42)
+    store.flush()
+    built = []
+
+    def factory():
+        built.append(True)
+        return BrightnessLimitsStore(path)
+
+    lazy = persistence.LazyStore(factory)
+    lazy.flush()
+    assert built == []
+
+    assert lazy.get_limit("node-1", "white", 0) == 42
+    assert lazy.get_limit("node-1", "white", 1) is None
+    assert built == [True]
+
+
+def test_unchanged_values_are_not_journaled(tmp_path):
+    path = tmp_path / "names.json"
+    store = ChannelNameStore(path)
+    store.set_name("node-1", "white", 0, "Desk")
+    view = store.get_names_for_node("node-1")
+
+    assert store.set_name("node-1", "white", 0, " Desk ") == "Desk"
+    store.set_name("node-1", "white", 1, None)
+    store.flush()
+    assert len((tmp_path / "names.json.log").read_text().splitlines()) == 1
+    assert store.get_names_for_node("node-1") is view
+
+    limits = BrightnessLimitsStore(tmp_path / "limits.json")
+    limits.set_limit("node-1", "white", 0, 300)
+    assert limits.set_limit("node-1", "white", 0, 255) == 255
+    limits.flush()
+    assert len((tmp_path / "limits.json.log").read_text().splitlines()) == 1
+
+
+def test_bulk_updates_apply_in_order_and_skip_no_ops(tmp_path):
+    path = tmp_path / "limits.json"
+    store = BrightnessLimitsStore(path)
+    store.set_limit("node-1", "ws", 0, 10)
+
+    stored = store.set_limits_bulk(
+        [
+            ("node-1", "ws", 0, 10),
+            ("node-1", "ws", 1, 999),
+            ("node-1", "ws", 2, 30),
+            ("node-1", "ws", 2, None),
+        ]
+    )
+    assert stored == [10, 255, 30, None]
+    store.flush()
+    assert len((tmp_path / "limits.json.log").read_text().splitlines()) == 4
+    assert BrightnessLimitsStore(path).get_limits_for_node("node-1") == {
+        "ws": {"0": 10, "1": 255}
+    }
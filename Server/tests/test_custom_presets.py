@@ -372,6 +372,7 @@ class PresetRateLimiterTests(unittest.TestCase):
 
         try:
             apply_preset(bus, preset)
+            self.assertTrue(bus.flush())
 
             published = [
                 (topic, json.loads(payload), retain)
@@ -416,6 +417,56 @@ class PresetRateLimiterTests(unittest.TestCase):
         finally:
             bus.shutdown()
 
+    def test_unsent_commands_to_same_topic_are_coalesced(self) -> None:
+        from app.mqtt_bus import MqttBus, topic_cmd
+
+        with mock.patch("app.mqtt_bus.paho.Client", RecordingClient):
+            bus = MqttBus(client_id="test-coalesce")
+
+        try:
+            # The batch keeps the worker from draining the queue until every
+            # command has been enqueued.
+            with bus.batch():
+                bus.white_set("node-7", 0, "solid", 10, [], rate_limited=False)
+                bus.ws_set("node-7", 0, "solid", 20, [1, 2, 3], rate_limited=False)
+                bus.white_set("node-7", 0, "solid", 30, [], rate_limited=False)
+            self.assertTrue(bus.flush())
+
+            published = [
+                (topic, json.loads(payload)["brightness"])
+                for topic, payload, _qos, _retain in bus.client.published_messages
+            ]
+            self.assertEqual(
+                published,
+                [
+                    (topic_cmd("node-7", "ws/set/0"), 20),
+                    (topic_cmd("node-7", "white/set/0"), 30),
+                ],
+            )
+        finally:
+            bus.shutdown()
+
+    def test_replaced_command_keeps_issue_order(self) -> None:
+        from app.mqtt_bus import MqttBus, topic_cmd
+
+        with mock.patch("app.mqtt_bus.paho.Client", RecordingClient):
+            bus = MqttBus(client_id="test-order")
+
+        try:
+            with bus.batch():
+                bus.motion_off("node-1", {})
+                bus.motion_on("node-1")
+                bus.motion_off("node-1", {})
+            self.assertTrue(bus.flush())
+
+            topics = [topic for topic, *_rest in bus.client.published_messages]
+            self.assertEqual(
+                topics,
+                [topic_cmd("node-1", "motion/on"), topic_cmd("node-1", "motion/off")],
+            )
+        finally:
+            bus.shutdown()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -34,6 +34,9 @@ class _NoopBus:
     def motion_status_request(self, *args, **kwargs):
         pass
 
+    def motion_status_request_many(self, *args, **kwargs):
+        pass
+
     def ota_check(self, *args, **kwargs):
         pass
 
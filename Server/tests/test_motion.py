@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import importlib
 import sys
-import threading
 import types
 from typing import Any, Dict, List, Tuple
 
@@ -33,6 +32,9 @@ class _NoopBus:
     def motion_status_request(self, *args: object, **kwargs: object) -> None:  # pragma: no cover - noop
         pass
 
+    def motion_status_request_many(self, *args: object, **kwargs: object) -> None:  # pragma: no cover - noop
+        pass
+
     def ota_check(self, *args: object, **kwargs: object) -> None:  # pragma: no cover - noop
         pass
 
@@ -106,6 +108,7 @@ class _RecordingBus:
         self.published: List[Tuple[str, Dict[str, Any], bool]] = []
         self.motion_status_requested: List[str] = []
         self.motion_off_commands: List[Tuple[str, Dict[str, Any]]] = []
+        self.motion_on_commands: List[str] = []
 
     def pub(self, topic: str, payload: Dict[str, Any], retain: bool = False) -> None:
         self.published.append((topic, payload, retain))
@@ -113,9 +116,35 @@ class _RecordingBus:
     def motion_status_request(self, node_id: str) -> None:
         self.motion_status_requested.append(node_id)
 
+    def motion_status_request_many(self, node_ids: List[str]) -> None:
+        self.motion_status_requested.extend(node_ids)
+
+    def motion_on(self, node_id: str) -> None:
+        self.motion_on_commands.append(node_id)
+
     def motion_off(self, node_id: str, payload: Dict[str, Any]) -> None:
         self.motion_off_commands.append((node_id, payload))
 
+    def motion_off_many(self, node_ids: List[str], payload: Dict[str, Any]) -> None:
+        for node_id in node_ids:
+            self.motion_off(node_id, payload)
+
+
+class _RecordingScheduler:
+    """Collects scheduled calls instead of running them."""
+
+    def __init__(self) -> None:
+        self.calls: List[Any] = []
+        self.delays: List[float] = []
+
+    def call_later(self, delay: float, func: Any, *args: Any) -> Any:
+        from app.scheduling import ScheduledCall
+
+        call = ScheduledCall(0.0, func, args)
+        self.calls.append(call)
+        self.delays.append(delay)
+        return call
+
 
 def _build_manager(module):
     manager = module.MotionManager.__new__(module.MotionManager)
@@ -123,9 +152,9 @@ def _build_manager(module):
     manager.active = {}
     manager.config = {}
     manager.room_sensors = {}
-    manager._status_request_lock = threading.Lock()
     manager._status_request_times = {}
     manager.motion_preferences = _TestMotionPrefs()
+    manager._scheduler = _RecordingScheduler()
     return manager
 
 
@@ -141,6 +170,7 @@ def test_motion_preferences_round_trip(tmp_path):
         "house", "room", [" node-a ", "node-b", "node-a", ""]
     )
     assert saved == {"node-a", "node-b"}
+    store.flush()
 
     reloaded = MotionPreferencesStore(prefs_path)
     assert reloaded.get_room_immune_nodes("house", "room") == {"node-a", "node-b"}
@@ -152,12 +182,32 @@ def test_motion_preferences_round_trip(tmp_path):
     reloaded.set_room_immune_nodes("house", "other", ["node-b"])
     reloaded.remove_node("node-b")
     assert reloaded.get_room_immune_nodes("house", "other") == set()
+    reloaded.flush()
 
     final = MotionPreferencesStore(prefs_path)
     assert final.get_room_immune_nodes("house", "room") == set()
     assert final.get_room_immune_nodes("house", "other") == set()
 
 
+def test_motion_preferences_writers_replace_the_snapshot(tmp_path):
+    from app.motion_prefs import MotionPreferencesStore
+
+    store = MotionPreferencesStore(tmp_path / "motion_prefs.json")
+    store.set_room_immune_nodes("house", "room", ["node-a"])
+    store.set_room_immune_nodes("other", "room", ["node-b"])
+    before = store._data
+    other_house = before["other"]
+
+    store.add_room_immune_node("house", "room", "node-c")
+    store.remove_node("node-a")
+
+    # Earlier snapshots are left untouched for readers still holding them.
+    assert before == {"house": {"room": {"node-a"}}, "other": {"room": {"node-b"}}}
+    assert store._data == {"house": {"room": {"node-c"}}, "other": {"room": {"node-b"}}}
+    assert store._data["other"] is other_house
+    store.flush()
+
+
 def test_apply_motion_preset_filters_actions(monkeypatch: pytest.MonkeyPatch, motion_module):
     manager = _build_manager(motion_module)
     manager.motion_preferences.set_room_immune_nodes(
@@ -249,22 +299,6 @@ def test_motion_event_applies_scheduled_preset(
     applied: List[Dict[str, Any]] = []
     monkeypatch.setattr(motion_module, "apply_preset", lambda bus, preset: applied.append(preset))
 
-    class DummyTimer:
-        def __init__(self, interval, func, args=None, kwargs=None):
-            self.interval = interval
-            self.func = func
-            self.args = args or ()
-            self.kwargs = kwargs or {}
-            self.started = False
-
-        def start(self) -> None:
-            self.started = True
-
-        def cancel(self) -> None:  # pragma: no cover - trivial stub
-            pass
-
-    monkeypatch.setattr(motion_module.threading, "Timer", DummyTimer)
-
     message = types.SimpleNamespace(
         topic="ul/kitchen/evt/pir/motion",
         payload=b'{"state": true}',
@@ -279,8 +313,8 @@ def test_motion_event_applies_scheduled_preset(
     entry = manager.active["kitchen"]
     assert entry["preset_on"] == "on"
     timer = entry["timers"].get("pir")
-    assert isinstance(timer, DummyTimer)
-    assert timer.started is True
+    assert manager._scheduler.calls == [timer]
+    assert manager._scheduler.delays == [45]
 
 
 def test_clear_sensor_sends_motion_off_commands(
@@ -364,28 +398,12 @@ def test_motion_event_skips_immune_nodes(monkeypatch: pytest.MonkeyPatch, motion
             }
         return None
 
-    class DummyTimer:
-        def __init__(self, interval, func, args=None, kwargs=None):
-            self.interval = interval
-            self.func = func
-            self.args = args or ()
-            self.kwargs = kwargs or {}
-            self.started = False
-            self.cancelled = False
-
-        def start(self) -> None:
-            self.started = True
-
-        def cancel(self) -> None:  # pragma: no cover - simple stub
-            self.cancelled = True
-
     monkeypatch.setattr(motion_module, "get_preset", fake_get_preset)
     monkeypatch.setattr(
         motion_module,
         "apply_preset",
         lambda bus, preset: applied.append(preset),
     )
-    monkeypatch.setattr(motion_module.threading, "Timer", DummyTimer)
 
     message = types.SimpleNamespace(
         topic="ul/node-1/evt/pir/motion",
@@ -401,9 +419,9 @@ def test_motion_event_skips_immune_nodes(monkeypatch: pytest.MonkeyPatch, motion
     assert entry["current"] == "pir"
     assert "pir" in entry["timers"]
     timer = entry["timers"]["pir"]
-    assert isinstance(timer, DummyTimer)
-    assert timer.started is True
-    assert timer.interval == 45
+    assert manager._scheduler.calls == [timer]
+    assert manager._scheduler.delays == [45]
+    assert timer.args == (room["id"], "pir")
 
     manager._clear_sensor(room["id"], "pir")
     assert applied == []
@@ -451,3 +469,44 @@ def test_ensure_room_loaded_requests_status(monkeypatch: pytest.MonkeyPatch, mot
     manager.ensure_room_loaded("house", "room")
 
     assert manager.bus.motion_status_requested == ["node"]
+
+
+def test_registry_status_requests_are_batched_and_throttled(
+    monkeypatch: pytest.MonkeyPatch, motion_module
+) -> None:
+    manager = _build_manager(motion_module)
+    house = {"id": "house"}
+    room = {"id": "room"}
+    nodes = [{"id": "a"}, {"id": "b"}, {"id": "a"}, {"name": "no id"}]
+    monkeypatch.setattr(
+        motion_module.registry,
+        "iter_nodes",
+        lambda: [(house, room, node) for node in nodes],
+    )
+
+    manager._request_status_for_registry()
+    assert manager.bus.motion_status_requested == ["a", "b"]
+
+    manager._request_status_for_registry()
+    assert manager.bus.motion_status_requested == ["a", "b"]
+
+    manager._request_status_for_registry(force=True)
+    assert manager.bus.motion_status_requested == ["a", "b", "a", "b"]
+
+
+def test_start_runs_once_even_without_a_bus_client(motion_module) -> None:
+    manager = _build_manager(motion_module)
+    manager.client = None
+    manager._started = False
+    calls: List[str] = []
+    manager._seed_room_sensors_from_config = lambda: calls.append("seed")
+    manager._request_status_for_registry = lambda: calls.append("status")
+
+    manager.start()
+    manager.start()
+    assert manager.client is None
+    assert calls == ["seed", "status"]
+
+    manager.stop()
+    manager.start()
+    assert calls == ["seed", "status", "seed", "status"]
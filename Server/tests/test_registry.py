@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app import registry
+from app.config import settings
+
+
+def test_get_room_index_tracks_in_place_edits():
+    house = {"id": "alpha", "rooms": [{"id": "kitchen"}, {"id": "den"}]}
+
+    assert registry.get_room(house, "den") is house["rooms"][1]
+
+    house["rooms"].pop(0)
+    assert registry.get_room(house, "kitchen") is None
+    assert registry.get_room(house, "den") is house["rooms"][0]
+
+    house["rooms"].append({"id": "attic"})
+    assert registry.get_room(house, "attic") is house["rooms"][1]
+
+
+def test_find_node_index_follows_in_place_edits(monkeypatch):
+    node = {"id": "node-a", "name": "A"}
+    spare = {"id": "node-b", "name": "B"}
+    room = {"id": "kitchen", "nodes": [node]}
+    house = {"id": "house", "rooms": [room], "nodes": [spare]}
+    monkeypatch.setattr(settings, "DEVICE_REGISTRY", [house])
+
+    assert registry.find_node("node-a") == (house, room, node)
+    assert registry.find_node("node-b") == (house, None, spare)
+    assert registry.find_node("missing") == (None, None, None)
+
+    # Moving nodes around in place must not return stale positions.
+    room["nodes"].insert(0, house["nodes"].pop())
+    assert registry.find_node("node-a") == (house, room, node)
+    assert registry.find_node("node-b") == (house, room, spare)
+
+    room["nodes"].remove(node)
+    assert registry.find_node("node-a") == (None, None, None)
+
+    replacement = [{"id": "other", "rooms": [{"id": "r", "nodes": [node]}]}]
+    monkeypatch.setattr(settings, "DEVICE_REGISTRY", replacement)
+    found_house, found_room, found_node = registry.find_node("node-a")
+    assert found_house is replacement[0] and found_node is node
+
+
+def test_find_node_miss_does_not_rebuild_current_index(monkeypatch, tmp_path):
+    room = {"id": "kitchen", "nodes": [{"id": "node-a"}]}
+    house = {"id": "house", "rooms": [room], "nodes": []}
+    monkeypatch.setattr(settings, "DEVICE_REGISTRY", [house])
+    monkeypatch.setattr(settings, "REGISTRY_FILE", tmp_path / "registry.json")
+    builds = []
+    real_build = registry._build_node_index
+
+    def counting_build(devices):
+        builds.append(True)
+        return real_build(devices)
+
+    monkeypatch.setattr(registry, "_build_node_index", counting_build)
+
+    assert registry.find_node("stranger") == (None, None, None)
+    assert registry.find_node("stranger") == (None, None, None)
+    assert registry.find_node("node-a")[2] is room["nodes"][0]
+    assert len(builds) == 1
+
+    node = registry.add_node("house", "kitchen", "Lamp")
+    assert registry.find_node(node["id"]) == (house, room, node)
+    assert len(builds) == 2
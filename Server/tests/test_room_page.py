@@ -36,6 +36,9 @@ class _NoopBus:
     def motion_status_request(self, *args, **kwargs):  # pragma: no cover - noop
         pass
 
+    def motion_status_request_many(self, *args, **kwargs):  # pragma: no cover - noop
+        pass
+
     def ota_check(self, *args, **kwargs):  # pragma: no cover - noop
         pass
 
@@ -0,0 +1,25 @@
+import sys
+import threading
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.scheduling import DeadlineScheduler  # noqa: E402
+
+
+def test_calls_run_in_deadline_order_and_cancelled_calls_are_skipped():
+    scheduler = DeadlineScheduler()
+    fired = []
+    done = threading.Event()
+
+    scheduler.call_later(0.2, lambda: (fired.append("last"), done.set()))
+    cancelled = scheduler.call_later(0.05, fired.append, "cancelled")
+    scheduler.call_later(0.1, fired.append, "second")
+    # Scheduling an earlier deadline wakes the thread from its longer wait.
+    scheduler.call_later(0.0, fired.append, "first")
+    cancelled.cancel()
+
+    assert done.wait(2)
+    assert fired == ["first", "second", "last"]
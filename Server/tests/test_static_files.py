@@ -0,0 +1,86 @@
+import gzip
+import os
+import sys
+from pathlib import Path
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.static_files import (  # noqa: E402
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    CachingStaticFiles,
+    precompress_static,
+)
+
+
+def _client(directory: Path) -> TestClient:
+    app = Starlette(
+        routes=[Mount("/static", CachingStaticFiles(directory=str(directory)))]
+    )
+    return TestClient(app)
+
+
+def test_static_assets_get_cache_headers_and_304s(tmp_path):
+    (tmp_path / "app.css").write_text("body {}")
+    (tmp_path / "app.3f2a9c1d.js").write_text("export {};")
+    client = _client(tmp_path)
+
+    response = client.get("/static/app.css")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+    revalidated = client.get(
+        "/static/app.css", headers={"If-None-Match": response.headers["etag"]}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+    hashed = client.get("/static/app.3f2a9c1d.js")
+    assert hashed.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_precompressed_variant_is_served_when_accepted(tmp_path):
+    source = "body { color: red; }\n" * 50
+    (tmp_path / "app.css").write_text(source)
+    precompress_static(tmp_path)
+    assert (tmp_path / "app.css.gz").exists()
+    client = _client(tmp_path)
+
+    response = client.get("/static/app.css", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == source
+
+    raw = client.get(
+        "/static/app.css", headers={"Accept-Encoding": "gzip;q=0, identity"}
+    )
+    assert "content-encoding" not in raw.headers
+    assert raw.text == source
+    assert int(raw.headers["content-length"]) == len(source)
+    assert gzip.decompress((tmp_path / "app.css.gz").read_bytes()).decode() == source
+
+
+def test_stale_variant_is_removed_when_not_rewritten(tmp_path):
+    asset = tmp_path / "a.css"
+    asset.write_text("a { color: red; }\n" * 50)
+    precompress_static(tmp_path)
+    variant = tmp_path / "a.css.gz"
+    assert variant.exists()
+
+    # The new content is too small to benefit from compression.
+    asset.write_text("b{}")
+    later = variant.stat().st_mtime + 10
+    os.utime(asset, (later, later))
+    precompress_static(tmp_path)
+    assert not variant.exists()
+
+    response = _client(tmp_path).get("/static/a.css", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "b{}"
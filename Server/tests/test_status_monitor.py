@@ -1,3 +1,4 @@
+import asyncio
 import json
 import sys
 from pathlib import Path
@@ -36,3 +37,67 @@ def test_snapshot_event_marks_node_online(monkeypatch):
     aged = monitor.snapshot().get("node-1")
     assert aged is not None
     assert aged["online"] is False
+
+
+def test_concurrent_snapshot_requests_share_one_publish():
+    monitor = StatusMonitor(timeout=30)
+    published: list[str] = []
+
+    def _publish() -> None:
+        published.append("node-1")
+        msg = _make_message("ul/node-1/evt/status", {"event": "snapshot"})
+        asyncio.get_running_loop().call_later(
+            0.01, monitor._on_message, monitor.client, None, msg
+        )
+
+    async def _burst():
+        return await asyncio.gather(
+            *(monitor.request_snapshot("node-1", _publish, 2.0) for _ in range(5))
+        )
+
+    results = asyncio.run(_burst())
+    assert published == ["node-1"]
+    assert all(seq == 1 and payload == {"event": "snapshot"} for seq, payload in results)
+    assert monitor._snapshot_requests == set()
+
+
+def test_recent_snapshot_is_served_without_publishing():
+    monitor = StatusMonitor(timeout=30)
+    monitor._on_message(
+        monitor.client, None, _make_message("ul/node-1/evt/status", {"event": "snapshot"})
+    )
+    published: list[str] = []
+
+    seq, payload = asyncio.run(
+        monitor.request_snapshot("node-1", lambda: published.append("node-1"), 0.01)
+    )
+    assert (seq, payload) == (1, {"event": "snapshot"})
+    assert published == []
+
+    monitor._last_snapshot["node-1"] -= 1.0
+    seq, payload = asyncio.run(
+        monitor.request_snapshot("node-1", lambda: published.append("node-1"), 0.01)
+    )
+    assert payload is None
+    assert published == ["node-1"]
+
+
+def test_repeated_payload_reuses_parsed_status():
+    monitor = StatusMonitor(timeout=30)
+
+    monitor._on_message(
+        monitor.client, None, _make_message("ul/node-1/evt/status", {"status": "ok"})
+    )
+    first = monitor.status_for("node-1")["payload"]
+    monitor._on_message(
+        monitor.client, None, _make_message("ul/node-1/evt/status", {"status": "ok"})
+    )
+    second = monitor.status_for("node-1")
+    assert second["payload"] is first
+    assert second["seq"] == 2
+    assert second["online"] is True
+
+    monitor._on_message(
+        monitor.client, None, _make_message("ul/node-1/evt/status", {"status": "boot"})
+    )
+    assert monitor.status_for("node-1")["status"] == "boot"